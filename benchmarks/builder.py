@@ -0,0 +1,58 @@
+'''
+# Word builder benchmark
+
+Cost of attaching a chain of suffixes to words of growing length,
+through strings against a `WordBuilder` that is joined once at the
+end. The stems are distinct so the stem profile cache does not hide
+the rescans of the string path.
+
+    python benchmarks/builder.py
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import get_prefix, synthetic_stems
+from kefir.predication import Copula, Person, predicate
+from kefir.subject import locative
+from kefir.suffix import WordBuilder
+
+LENGTHS = (0, 64, 512)
+COPULAS = (Copula.PROGRESSIVE, Copula.PERFECTIVE, Copula.CONDITIONAL)
+
+def inflect(word):
+  word = locative(word)
+
+  for copula in COPULAS:
+    word = predicate(word, Person.FIRST, copula, True)
+
+  return word
+
+def measure(words, build):
+  started = time.perf_counter()
+  forms = [str(inflect(build(word))) for word in words]
+  return forms, (time.perf_counter() - started) / len(words)
+
+def run(count=20000):
+  print('%-8s %12s %12s' % ('length', 'string', 'builder'))
+
+  for length in LENGTHS:
+    prefix = get_prefix(length)
+    words = [prefix + stem for stem in synthetic_stems(count)]
+
+    expected, string = measure(words, str)
+    forms, builder = measure(words, WordBuilder)
+
+    assert forms == expected
+
+    print('%-8d %9.0f ns %9.0f ns (%.1fx)' % (
+      length,
+      string * 1e9,
+      builder * 1e9,
+      string / builder,
+    ))
+
+if __name__ == '__main__':
+  run(*map(int, sys.argv[1:]))
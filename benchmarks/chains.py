@@ -0,0 +1,80 @@
+'''
+# Chain benchmark
+
+Per-stem cost of case and copula chains of depth 1 to 4, written as
+nested `predicate` calls against one `compile_chain` plan, on short
+and long stems. The outputs of both are compared before timing is
+reported.
+
+    python benchmarks/chains.py
+'''
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import stems, long_stems, synthetic_stems
+from kefir.batch import compile_chain
+from kefir.predication import Copula, Person, predicate
+from kefir.subject import GrammaticalCase, locative
+
+CHAINS = (
+  (GrammaticalCase.LOCATIVE,),
+  (GrammaticalCase.LOCATIVE, Copula.PERFECTIVE),
+  (GrammaticalCase.LOCATIVE, Copula.PROGRESSIVE, Copula.PERFECTIVE),
+  (
+    GrammaticalCase.LOCATIVE,
+    Copula.PROGRESSIVE,
+    Copula.PERFECTIVE,
+    Copula.CONDITIONAL,
+  ),
+)
+
+def nested(stem, copulas):
+  text = locative(stem)
+
+  for copula in copulas:
+    text = predicate(text, Person.FIRST, copula, True)
+
+  return text
+
+def per_stem(function, words, repeat=5, number=20):
+  best = min(timeit.repeat(
+    lambda: [function(word) for word in words],
+    repeat=repeat,
+    number=number,
+  ))
+  return best / (number * len(words))
+
+def run():
+  corpora = (
+    ('short', stems() + synthetic_stems(2000)),
+    ('long', long_stems()),
+  )
+
+  print('%-6s %-6s %12s %12s' % ('depth', 'stems', 'nested', 'fused'))
+
+  for chain in CHAINS:
+    copulas = chain[1:]
+    plan = compile_chain(chain, Person.FIRST, True)
+
+    def call(stem):
+      return nested(stem, copulas)
+
+    for name, words in corpora:
+      assert list(map(call, words)) == list(map(plan, words))
+
+      before = per_stem(call, words)
+      after = per_stem(plan, words)
+
+      print('%-6d %-6s %9.0f ns %9.0f ns (%.1fx)' % (
+        len(chain),
+        name,
+        before * 1e9,
+        after * 1e9,
+        before / after,
+      ))
+
+if __name__ == '__main__':
+  run()
@@ -0,0 +1,48 @@
+'''
+# Benchmark corpus
+
+Stems used by the benchmarks, grouped by the harmony class of
+their last vowel. Code is our data, so longer stems are derived
+from these by agglutination instead of being loaded from a file.
+'''
+from itertools import cycle, islice, product
+
+STEMS = {
+  'back unrounded': ('dal', 'araba', 'kitap', 'ağaç', 'yonca', 'kaş', 'bıçak', 'masa'),
+  'front unrounded': ('elma', 'gezegen', 'kalem', 'ev', 'kedi', 'renk', 'gel', 'git'),
+  'back rounded': ('yolcu', 'okul', 'robot', 'marul', 'top', 'kuş', 'yurt', 'çorap'),
+  'front rounded': ('üzüm', 'göz', 'köpek', 'süt', 'türk', 'ören', 'gönül', 'söz'),
+}
+
+SUFFIXES = ('lar', 'ler', 'lık', 'lik', 'cı', 'ci', 'sız', 'siz', 'daş', 'deş')
+
+def stems():
+  return [stem for group in STEMS.values() for stem in group]
+
+def get_prefix(length):
+  return ''.join(islice(cycle(SUFFIXES), length))[:length]
+
+def long_stems(length=32):
+  prefix = get_prefix(length)
+  return [prefix + stem for stem in stems()]
+
+def grouped_stems(length=0):
+  prefix = get_prefix(length)
+  return {
+    group: [prefix + stem for stem in members]
+    for group, members in STEMS.items()
+  }
+
+def synthetic_stems(count):
+  syllables = [
+    onset + vowel + coda
+    for onset, vowel, coda in product(
+      ('b', 'ç', 'd', 'g', 'k', 'm', 's', 't', 'y'),
+      ('a', 'e', 'ı', 'i', 'o', 'ö', 'u', 'ü'),
+      ('', 'l', 'n', 'r', 'k', 't'),
+    )
+  ]
+  return list(islice(
+    (''.join(parts) for parts in product(syllables, repeat=3)),
+    count,
+  ))
@@ -0,0 +1,73 @@
+'''
+# Derivation benchmark
+
+Per-form cost of the full copula chain inventory of a stem, built
+chain by chain with nested `predicate` calls, chain by chain with
+`compile_chain` plans, and in one walk of `derive`, which shares the
+forms of common prefixes. The outputs are compared before timing is
+reported.
+
+    python benchmarks/derivation.py
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import stems, synthetic_stems
+from kefir.batch import compile_chain
+from kefir.derivation import derive
+from kefir.phonology import analyze
+from kefir.predication import Person, predicate
+
+PERSON = Person.FIRST
+IS_PLURAL = True
+
+def nested(words, chains):
+  return [
+    form
+    for word in words
+    for form in (predicate(word, PERSON, chain, IS_PLURAL) for chain in chains)
+  ]
+
+def fused(words, chains):
+  plans = [compile_chain(chain, PERSON, IS_PLURAL) for chain in chains]
+  return [plan(word) for word in words for plan in plans]
+
+def walked(words, chains):
+  return [
+    form
+    for word in words
+    for _, form in derive(word, PERSON, IS_PLURAL)
+  ]
+
+def per_form(function, words, chains, repeat=5):
+  best = None
+
+  for _ in range(repeat):
+    analyze.cache_clear()
+    started = time.perf_counter()
+    forms = function(words, chains)
+    elapsed = time.perf_counter() - started
+    best = elapsed if best is None else min(best, elapsed)
+
+  return forms, best / len(forms)
+
+def run():
+  words = stems() + synthetic_stems(2000)
+  chains = [chain for chain, _ in derive(words[0], PERSON, IS_PLURAL)]
+
+  print('%d stems, %d chains' % (len(words), len(chains)))
+
+  expected, before = per_form(nested, words, chains)
+
+  for name, function in (('nested', nested), ('fused', fused), ('derive', walked)):
+    forms, elapsed = per_form(function, words, chains)
+
+    assert forms == expected
+
+    print('%-8s %9.0f ns (%.1fx)' % (name, elapsed * 1e9, before / elapsed))
+
+if __name__ == '__main__':
+  run()
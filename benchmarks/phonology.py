@@ -0,0 +1,51 @@
+'''
+# Phonology benchmark
+
+Per-word cost of the phonology predicates on short and long stems.
+
+    python benchmarks/phonology.py
+'''
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import stems, long_stems
+from kefir.phonology import (get_last_vowel,
+                             get_vowel_symbol,
+                             determine_vowel_harmony,
+                             is_front,
+                             is_rounded,
+                             harmony,
+                             ends_with_consonant)
+
+def harmonize(text):
+  return harmony(get_vowel_symbol(get_last_vowel(text)))
+
+PREDICATES = (
+  ('get_last_vowel', get_last_vowel),
+  ('determine_vowel_harmony', determine_vowel_harmony),
+  ('is_front', is_front),
+  ('is_rounded', is_rounded),
+  ('harmony', harmonize),
+  ('ends_with_consonant', ends_with_consonant),
+)
+
+def per_word(function, words, repeat=5, number=200):
+  best = min(timeit.repeat(
+    lambda: [function(word) for word in words],
+    repeat=repeat,
+    number=number,
+  ))
+  return best / (number * len(words))
+
+def run():
+  corpora = (('short', stems()), ('long', long_stems()))
+  print('%-24s %12s %12s' % ('function', *(name for name, _ in corpora)))
+  for name, function in PREDICATES:
+    costs = (per_word(function, words) * 1e9 for _, words in corpora)
+    print('%-24s %9.0f ns %9.0f ns' % (name, *costs))
+
+if __name__ == '__main__':
+  run()
@@ -0,0 +1,125 @@
+'''
+# Server load test
+
+Starts `python -m kefir serve` on a free local port (or uses the one
+given), opens a number of connections that each keep a number of
+requests in flight, and reports requests per second with the p50 and
+p99 latency from writing a request to reading its answer.
+
+    python benchmarks/server.py [connections] [requests per connection]
+                                [in flight] [port]
+'''
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from itertools import cycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import synthetic_stems
+from inflect_many import PLANS
+
+def get_lines(count):
+  plans = cycle(PLANS)
+  stems = cycle(synthetic_stems(10000))
+
+  return [
+    json.dumps(dict(
+      zip(('stem', 'case', 'person', 'copula', 'plural'), (stem, *plan)),
+    ), ensure_ascii=False).encode('utf-8') + b'\n'
+    for stem, plan in zip(stems, (next(plans) for _ in range(count)))
+  ]
+
+def get_free_port():
+  with socket.socket() as listener:
+    listener.bind(('127.0.0.1', 0))
+    return listener.getsockname()[1]
+
+async def wait_for_server(port, timeout=10):
+  deadline = time.monotonic() + timeout
+
+  while True:
+    try:
+      _, writer = await asyncio.open_connection('127.0.0.1', port)
+      writer.close()
+      return
+    except OSError:
+      if time.monotonic() > deadline:
+        raise
+
+      await asyncio.sleep(0.05)
+
+async def client(port, lines, in_flight, latencies):
+  reader, writer = await asyncio.open_connection('127.0.0.1', port)
+  slots = asyncio.Semaphore(in_flight)
+  sent = []
+
+  async def send():
+    for line in lines:
+      await slots.acquire()
+      sent.append(time.perf_counter())
+      writer.write(line)
+      await writer.drain()
+
+  sender = asyncio.create_task(send())
+
+  for index in range(len(lines)):
+    response = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - sent[index])
+    slots.release()
+
+    if 'form' not in response:
+      raise Exception('request failed: %s' % response)
+
+  await sender
+  writer.close()
+
+async def load(port, connections, requests, in_flight):
+  lines = get_lines(requests)
+  latencies = []
+  started = time.perf_counter()
+
+  await asyncio.gather(*(
+    client(port, lines, in_flight, latencies)
+    for _ in range(connections)
+  ))
+
+  elapsed = time.perf_counter() - started
+  latencies.sort()
+
+  print('%d connections, %d requests, %d in flight per connection' % (
+    connections,
+    len(latencies),
+    in_flight,
+  ))
+  print('%.0f requests/s' % (len(latencies) / elapsed))
+  print('latency p50 %.2f ms, p99 %.2f ms' % (
+    latencies[len(latencies) // 2] * 1000,
+    latencies[len(latencies) * 99 // 100] * 1000,
+  ))
+
+def run(connections=16, requests=20000, in_flight=64, port=None):
+  server = None
+
+  if port is None:
+    port = get_free_port()
+    server = subprocess.Popen(
+      [sys.executable, '-m', 'kefir', 'serve', '--port', str(port)],
+      cwd=ROOT,
+    )
+
+  try:
+    asyncio.run(wait_for_server(port))
+    asyncio.run(load(port, connections, requests, in_flight))
+  finally:
+    if server is not None:
+      server.terminate()
+      server.wait()
+
+if __name__ == '__main__':
+  run(*map(int, sys.argv[1:]))
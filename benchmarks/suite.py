@@ -0,0 +1,172 @@
+'''
+# Processor benchmark suite
+
+Per-call cost of every case processor, every copula processor,
+`possesive`, `combinator` and `swap_front_and_back`, over the
+benchmark corpus grouped by the harmony class of the last vowel and
+by stem length (the stem alone, and with 8 and 32 letters of
+agglutinated prefix). columns are labelled by the initials of the
+harmony class, `fr/8` is front rounded with an 8 letter prefix.
+
+    python benchmarks/suite.py run [--output results.json]
+    python benchmarks/suite.py compare baseline.json results.json
+                                       [--threshold 0.1]
+
+`run` prints a table and saves it as JSON, `compare` prints the
+ratio of every timing to the baseline and exits with status 1 when
+one of them is slower by more than the threshold.
+'''
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import grouped_stems
+from kefir.phonology import swap_front_and_back
+from kefir.predication import (Copula,
+                               Person,
+                               combinator,
+                               get_copula_processor)
+from kefir.subject import GrammaticalCase, get_case_processor, possesive
+
+VERSION = 1
+LENGTHS = (0, 8, 32)
+THRESHOLD = 0.1
+CHAIN = (Copula.PROGRESSIVE, Copula.PERFECTIVE)
+
+def get_processors():
+  for case in GrammaticalCase:
+    yield 'case.%s' % case.name.lower(), get_case_processor(case)
+
+  for copula in Copula:
+    processor = get_copula_processor(copula)
+    yield 'copula.%s' % copula.value, (
+      lambda text, processor=processor: processor(text, Person.FIRST, True)
+    )
+
+  yield 'possesive', lambda text: possesive(text, Person.FIRST)
+  yield 'combinator', lambda text: combinator(CHAIN, text, Person.FIRST, True)
+  yield 'swap_front_and_back', swap_front_and_back
+
+def get_groups():
+  for length in LENGTHS:
+    for group, stems in grouped_stems(length).items():
+      yield '%s/%d' % (group, length), stems
+
+def per_call(function, stems, repeat=7, number=200):
+  best = min(timeit.repeat(
+    lambda: [function(stem) for stem in stems],
+    repeat=repeat,
+    number=number,
+  ))
+  return best / (number * len(stems))
+
+def measure():
+  groups = list(get_groups())
+
+  return {
+    name: {
+      group: per_call(function, stems) * 1e9
+      for group, stems in groups
+    }
+    for name, function in get_processors()
+  }
+
+def get_label(group):
+  harmony, length = group.split('/')
+  return '%s/%s' % (''.join(word[0] for word in harmony.split()), length)
+
+def run(arguments):
+  results = measure()
+  groups = next(iter(results.values()))
+
+  print('%-24s %s' % ('ns per call', ' '.join(
+    '%7s' % get_label(group) for group in groups
+  )))
+
+  for name, timings in results.items():
+    print('%-24s %s' % (name, ' '.join(
+      '%7.0f' % timing for timing in timings.values()
+    )))
+
+  with open(arguments.output, 'w') as output:
+    json.dump({
+      'version': VERSION,
+      'python': platform.python_version(),
+      'machine': platform.machine(),
+      'results': results,
+    }, output, indent=2)
+
+  print('saved to %s' % arguments.output)
+
+def load(path):
+  with open(path) as source:
+    data = json.load(source)
+
+  if data.get('version') != VERSION:
+    raise Exception('invalid benchmark file %s. run it again' % path)
+
+  return data['results']
+
+def compare(arguments):
+  baseline, current = load(arguments.baseline), load(arguments.current)
+  regressions = []
+
+  for name, timings in current.items():
+    for group, timing in timings.items():
+      reference = baseline.get(name, {}).get(group)
+
+      if reference is None:
+        continue
+
+      ratio = timing / reference
+      flag = ''
+
+      if ratio > 1 + arguments.threshold:
+        flag = ' regression'
+        regressions.append((name, group))
+
+      print('%-24s %-24s %9.0f → %9.0f ns %6.2fx%s' % (
+        name,
+        group,
+        reference,
+        timing,
+        ratio,
+        flag,
+      ))
+
+  print('%d regressions over %.0f%%' % (
+    len(regressions),
+    arguments.threshold * 100,
+  ))
+
+  return 1 if regressions else 0
+
+def get_parser():
+  parser = argparse.ArgumentParser(prog='benchmarks/suite.py')
+  commands = parser.add_subparsers(dest='command', required=True)
+
+  command = commands.add_parser('run', help='time every processor')
+  command.add_argument('--output', default='benchmark.json')
+  command.set_defaults(run=run)
+
+  command = commands.add_parser('compare', help='compare two runs')
+  command.add_argument('baseline')
+  command.add_argument('current')
+  command.add_argument(
+    '--threshold',
+    type=float,
+    default=THRESHOLD,
+    help='slowdown ratio flagged as a regression, 0.1 is 10%%',
+  )
+  command.set_defaults(run=compare)
+
+  return parser
+
+if __name__ == '__main__':
+  arguments = get_parser().parse_args()
+  sys.exit(arguments.run(arguments))
@@ -0,0 +1,68 @@
+'''
+# Transducer benchmark
+
+Forms per second of `Transducer.generate` against calling `subject`
+and `predicate` once per form, over the same requests as the batch
+benchmark. The forms of both are compared before timing is reported.
+
+    python benchmarks/transducer.py [stems] [forms per stem]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inflect_many import get_requests, measure, per_call
+from kefir.predication import Copula, Person
+from kefir.transducer import TRANSDUCER, get_tag
+
+def get_tags(case, person, copula, is_plural):
+  tags = () if case == 'nominative' else (case,)
+
+  if copula != Copula.ZERO.value:
+    tags += (get_tag(copula, Person(person), is_plural),)
+
+  return tags
+
+def transducer(requests):
+  generate = TRANSDUCER.generate
+  return [
+    generate(stem, *get_tags(*features))
+    for stem, *features in requests
+  ]
+
+def compiled(requests):
+  generate = TRANSDUCER.generate
+  requests = [
+    (stem, get_tags(*features))
+    for stem, *features in requests
+  ]
+
+  started = time.perf_counter()
+  forms = [generate(stem, *tags) for stem, tags in requests]
+  return forms, len(requests) / (time.perf_counter() - started)
+
+def run(count=100000, forms=8):
+  requests = get_requests(count, forms)
+  expected, per_call_rate = measure(per_call, requests)
+  forms, transducer_rate = measure(transducer, requests)
+
+  assert forms == expected
+
+  forms, tagged_rate = compiled(requests)
+
+  assert forms == expected
+
+  print('per call              %10.0f forms/s' % per_call_rate)
+  print('transducer            %10.0f forms/s (%.1fx)' % (
+    transducer_rate,
+    transducer_rate / per_call_rate,
+  ))
+  print('transducer, pre-tagged %9.0f forms/s (%.1fx)' % (
+    tagged_rate,
+    tagged_rate / per_call_rate,
+  ))
+
+if __name__ == '__main__':
+  run(*map(int, sys.argv[1:]))
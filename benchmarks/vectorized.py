@@ -0,0 +1,76 @@
+'''
+# Vectorized phonology benchmark
+
+Per-stem cost of classifying a batch of stems (last vowel, front,
+rounded, final consonant) with the scalar predicates of
+`kefir.phonology` in a loop, and with `kefir.vectorized.classify` on
+the whole batch. The answers are compared before timing is reported.
+
+    python benchmarks/vectorized.py
+'''
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import stems, synthetic_stems
+from kefir.phonology import (get_last_vowel,
+                             is_front,
+                             is_rounded,
+                             ends_with_consonant)
+from kefir.vectorized import classify, CONSONANT
+
+SIZES = (100, 10000, 100000)
+
+def scalar(words):
+  return [
+    (
+      get_last_vowel(word),
+      is_front(word),
+      is_rounded(word),
+      ends_with_consonant(word),
+    )
+    for word in words
+  ]
+
+def vectorized(words):
+  result = classify(words)
+  return list(zip(
+    map(chr, result.last_vowel.tolist()),
+    result.is_front.tolist(),
+    result.is_rounded.tolist(),
+    (result.final & CONSONANT).astype(bool).tolist(),
+  ))
+
+def per_stem(function, words, repeat=5):
+  number = max(1, 100000 // len(words))
+  best = min(timeit.repeat(
+    lambda: function(words),
+    repeat=repeat,
+    number=number,
+  ))
+  return best / (number * len(words))
+
+def run():
+  corpus = stems() + synthetic_stems(max(SIZES))
+
+  print('%8s %12s %12s %8s' % ('stems', 'scalar', 'vectorized', 'speedup'))
+
+  for size in SIZES:
+    words = corpus[:size]
+
+    assert vectorized(words) == scalar(words)
+
+    before = per_stem(scalar, words)
+    after = per_stem(lambda words: classify(words), words)
+
+    print('%8d %9.0f ns %9.0f ns %7.1fx' % (
+      size,
+      before * 1e9,
+      after * 1e9,
+      before / after,
+    ))
+
+if __name__ == '__main__':
+  run()
@@ -0,0 +1,45 @@
+'''
+# Parallel inflection benchmark
+
+Forms per second of `inflect_many` with 1, 2, 4 and 8 workers over
+requests for 100k stems, with the chunk size tuned automatically.
+Every run is checked against the single process output.
+
+    python benchmarks/workers.py [stems] [forms per stem]
+'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inflect_many import get_requests, measure
+from kefir.batch import inflect_many
+
+WORKERS = (1, 2, 4, 8)
+
+def run(count=100000, forms=8):
+  requests = get_requests(count, forms)
+  expected = None
+  baseline = None
+
+  print('%d cpus' % os.cpu_count())
+
+  for workers in WORKERS:
+    forms, rate = measure(
+      lambda requests: list(inflect_many(requests, workers=workers)),
+      requests,
+    )
+
+    if expected is None:
+      expected, baseline = forms, rate
+
+    assert forms == expected
+
+    print('%d workers  %10.0f forms/s (%.1fx)' % (
+      workers,
+      rate,
+      rate / baseline,
+    ))
+
+if __name__ == '__main__':
+  run(*map(int, sys.argv[1:]))
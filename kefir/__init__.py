@@ -79,6 +79,20 @@ Kefir is designed to construct sentences by using
 '''
 from .subject import subject, locative, genitive
 from .predication import predicate, Copula
+from .batch import inflect_many, Inflection, compile_predicate, compile_chain
+from .paradigm import Paradigm
+from .suffix import WordBuilder, SegmentedWord, Segmentation
+from .analysis import Analyzer, Reading
+from .transducer import Transducer, TRANSDUCER
+from .lexicon import Lexicon, write_lexicon
+from .generation import sentences, get_shard
+from .language import Language, Profile, get_language
+from .pronoun import decline
+from .irregular import Irregular, get_irregular, add_irregular, load_irregulars
+from .normalization import normalize
+from .pronunciation import pronounce
+from .derivation import derive, Derivation
+from . import instrumentation
 from .functional import enum_values
 
 def sentence(subject, predicate, delimiter=' '):
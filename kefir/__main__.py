@@ -1,3 +1,46 @@
+'''
+# Command line
+
+    python -m kefir inflect [requests.tsv] [--format tsv|jsonl]
+                            [--workers N] [--stats]
+                            [--language NAME]
+    python -m kefir lexicon stems.txt forms.lexicon
+    python -m kefir serve [--host HOST] [--port PORT] [--unix PATH]
+
+`inflect` reads one request per line, from a file or standard input,
+and streams every request back with its form:
+
+  - tsv: `stem case person copula plural`, trailing columns may be
+    left out. the form is appended as the last column
+  - jsonl: an object with the same keys (or `is_plural`) or an array
+    in the same order. the form is added as `form`, or appended
+
+A request that cannot be read or inflected does not stop the stream:
+its error is reported on standard error with its number in tsv, and
+written in its place as an object with an `error` in jsonl. The exit
+status is 1 when any request failed.
+
+Requests are read, inflected and written a chunk at a time, so memory
+does not grow with the input. `--workers` spreads the chunks over a
+process pool and keeps their order. `--stats` reports throughput on
+standard error, with the percentiles of the time it takes to inflect
+and write a chunk of output: it measures chunks, not single requests.
+`--language` inflects with the sounds of another profile of
+`kefir.language`, in one process, so it does not take `--workers`.
+
+stems for `lexicon` are read one per line, `-` reads them from
+standard input. `serve` is documented in `kefir.server`.
+'''
+import argparse
+import asyncio
+import json
+import sys
+import time
+from itertools import tee
+
+from .batch import CHUNK_SIZE, chunked, inflect_many
+from .language import PROFILES, get_language
+from .server import WINDOW, BATCH_SIZE, serve as run_server
 from .phonology import (
     harmony,
     is_back,
@@ -7,3 +50,267 @@ from .phonology import (
     devoice,
 )
 
+BUFFER_SIZE = 1 << 20
+
+FORMATS = ('tsv', 'jsonl')
+
+PERCENTILES = (50, 90, 99)
+
+def parse_tsv(line):
+  record = line.rstrip('\r\n')
+  stem, *features = record.split('\t')
+  return (record, None), (
+    stem,
+    *(feature or None for feature in features[:4]),
+  )
+
+def parse_jsonl(line):
+  try:
+    record = json.loads(line)
+  except ValueError as error:
+    return (line.rstrip('\r\n'), error), None
+
+  if isinstance(record, list):
+    return (record, None), tuple(record)
+
+  if not isinstance(record, dict) or 'stem' not in record:
+    return (record, Exception('invalid request. a stem is required')), None
+
+  return (record, None), (
+    record['stem'],
+    record.get('case'),
+    record.get('person'),
+    record.get('copula'),
+    record.get('is_plural', record.get('plural')),
+  )
+
+def format_tsv(record, form):
+  return '%s\t%s\n' % (record, form)
+
+def format_jsonl(record, form):
+  if isinstance(record, list):
+    record = [*record, form]
+  else:
+    record = {**record, 'form': form}
+
+  return json.dumps(record, ensure_ascii=False) + '\n'
+
+def get_message(error):
+  return str(error) or type(error).__name__
+
+def fail_tsv(record, error, number):
+  print('request %d: %s' % (number, get_message(error)), file=sys.stderr)
+  return ''
+
+def fail_jsonl(record, error, number):
+  if not isinstance(record, dict):
+    record = {'request': record}
+
+  return json.dumps(
+    {**record, 'error': get_message(error)},
+    ensure_ascii=False,
+  ) + '\n'
+
+PARSERS = {'tsv': parse_tsv, 'jsonl': parse_jsonl}
+FORMATTERS = {'tsv': format_tsv, 'jsonl': format_jsonl}
+FAILURES = {'tsv': fail_tsv, 'jsonl': fail_jsonl}
+
+def get_format(path):
+  if path.endswith(('.jsonl', '.json', '.ndjson')):
+    return 'jsonl'
+
+  return 'tsv'
+
+def open_input(path):
+  return open(
+    sys.stdin.fileno() if path == '-' else path,
+    encoding='utf-8',
+    buffering=BUFFER_SIZE,
+    closefd=path != '-',
+  )
+
+def open_output():
+  return open(
+    sys.stdout.fileno(),
+    'w',
+    encoding='utf-8',
+    buffering=BUFFER_SIZE,
+    closefd=False,
+  )
+
+def get_percentile(values, percentile):
+  return values[min(len(values) - 1, len(values) * percentile // 100)]
+
+def report(count, chunks, elapsed, output=sys.stderr):
+  chunks = sorted(chunks)
+
+  print('%d requests in %.3fs, %.0f requests/s' % (
+    count,
+    elapsed,
+    count / elapsed if elapsed else 0,
+  ), file=output)
+
+  if chunks:
+    print('output chunk latency %s ms' % ', '.join(
+      'p%d %.2f' % (percentile, get_percentile(chunks, percentile) * 1000)
+      for percentile in PERCENTILES
+    ), file=output)
+
+def inflect(arguments):
+  format = arguments.format or get_format(arguments.requests)
+  parse = PARSERS[format]
+  write, fail = FORMATTERS[format], FAILURES[format]
+  chunks = []
+  count = 0
+  errors = 0
+  started = time.perf_counter()
+
+  with open_input(arguments.requests) as lines, open_output() as output:
+    records, requests = tee(map(parse, filter(str.strip, lines)))
+    requests = (request for _, request in requests)
+
+    if arguments.language:
+      forms = get_language(arguments.language).inflect_many(
+        requests,
+        arguments.chunk_size,
+        return_exceptions=True,
+      )
+    else:
+      forms = inflect_many(
+        requests,
+        arguments.chunk_size,
+        arguments.workers,
+        return_exceptions=True,
+      )
+
+    results = zip((record for record, _ in records), forms)
+    chunk_started = time.perf_counter()
+
+    for chunk in chunked(results, arguments.chunk_size or CHUNK_SIZE):
+      output.write(''.join(
+        write(record, form) if type(form) is str
+        else fail(record, form if error is None else error, number)
+        for number, ((record, error), form) in enumerate(chunk, count + 1)
+      ))
+      chunks.append(time.perf_counter() - chunk_started)
+      chunk_started = time.perf_counter()
+      count += len(chunk)
+      errors += sum(type(form) is not str for _, form in chunk)
+
+  if arguments.stats:
+    report(count, chunks, time.perf_counter() - started)
+
+  return 1 if errors else 0
+
+def read_stems(path):
+  lines = sys.stdin if path == '-' else open(path, encoding='utf-8')
+
+  with lines:
+    for line in lines:
+      stem = line.strip()
+
+      if stem:
+        yield stem
+
+def lexicon(arguments):
+  from .lexicon import write_lexicon
+
+  count = write_lexicon(read_stems(arguments.stems), arguments.output)
+  print('%d forms written to %s' % (count, arguments.output), file=sys.stderr)
+
+def serve(arguments):
+  try:
+    asyncio.run(run_server(
+      arguments.host,
+      arguments.port,
+      arguments.unix,
+      window=arguments.window / 1000,
+      batch_size=arguments.batch_size,
+    ))
+  except KeyboardInterrupt:
+    pass
+
+def get_parser():
+  parser = argparse.ArgumentParser(prog='python -m kefir')
+  commands = parser.add_subparsers(dest='command', required=True)
+
+  command = commands.add_parser(
+    'inflect',
+    help='inflect a stream of tsv or json lines requests',
+  )
+  command.add_argument(
+    'requests',
+    nargs='?',
+    default='-',
+    help='requests, one per line, - for stdin (default)',
+  )
+  command.add_argument(
+    '--format',
+    choices=FORMATS,
+    help='request format, by default jsonl for .jsonl files, else tsv',
+  )
+  command.add_argument(
+    '--chunk-size',
+    type=int,
+    help='requests inflected at a time, tuned by default with --workers',
+  )
+  command.add_argument(
+    '--workers',
+    type=int,
+    default=1,
+    help='processes to inflect chunks in, not with --language',
+  )
+  command.add_argument(
+    '--stats',
+    action='store_true',
+    help='report throughput and output chunk latency percentiles on stderr',
+  )
+  command.add_argument(
+    '--language',
+    choices=PROFILES,
+    help='inflect with the sounds of this language, turkish by default',
+  )
+  command.set_defaults(run=inflect)
+
+  command = commands.add_parser(
+    'lexicon',
+    help='write every paradigm form of a stem list to a lexicon file',
+  )
+  command.add_argument('stems', help='stems, one per line, - for stdin')
+  command.add_argument('output', help='lexicon file to write')
+  command.set_defaults(run=lexicon)
+
+  command = commands.add_parser(
+    'serve',
+    help='serve line-delimited json inflection requests over a socket',
+  )
+  command.add_argument('--host', default='127.0.0.1')
+  command.add_argument('--port', type=int, default=8470)
+  command.add_argument('--unix', help='unix socket path instead of tcp')
+  command.add_argument(
+    '--window',
+    type=float,
+    default=WINDOW * 1000,
+    help='milliseconds a request waits for others to join its batch',
+  )
+  command.add_argument(
+    '--batch-size',
+    type=int,
+    default=BATCH_SIZE,
+    help='most requests in one batch',
+  )
+  command.set_defaults(run=serve)
+
+  return parser
+
+def main(argv=None):
+  parser = get_parser()
+  arguments = parser.parse_args(argv)
+
+  if getattr(arguments, 'language', None) and arguments.workers > 1:
+    parser.error('argument --workers: not allowed with argument --language')
+
+  return arguments.run(arguments)
+
+if __name__ == '__main__':
+  sys.exit(main())
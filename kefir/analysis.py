@@ -0,0 +1,217 @@
+'''
+# Morphological Analysis
+
+The reverse of `subject`, `possesive` and `predicate`: from a surface
+form back to every (stem, case, copula, person, plural) reading.
+
+Every form kefir generates is a base followed by a suffix, where the
+base is the stem, its softened variant or, for an irregular stem
+before a softening suffix that starts with a vowel, its alternate
+(see `kefir.irregular`). The analyzer keeps two hash indexes instead
+of one entry per generated form:
+
+  - bases, mapping the stem, its softened variant and its alternate
+    to the interned stem number
+  - suffixes, mapping every allomorph of every form and the class of
+    the stem it follows to small integers naming the feature bundles
+
+Analysis tries each split of the surface form, so it takes as many
+dictionary probes as the word has letters, however many stems are
+indexed, and memory grows with the number of stems, not forms.
+
+A personal pronoun is indexed by its declined forms (bana, onun), each
+taking the copulas but no case or plural suffix of its own.
+
+Negative copulas are written as two words and are not indexed.
+'''
+from array import array
+from collections import namedtuple
+
+from .phonology import analyze, voice, KEYS, MissingVowelSound
+from .predication import Person, Copula, COPULAS
+from .pronoun import PRONOUNS, decline
+from .subject import GrammaticalCase, CASES, POSSESSIVE
+from .suffix import Suffix, Template
+
+Reading = namedtuple(
+  'Reading',
+  ('stem', 'case', 'copula', 'person', 'is_plural'),
+)
+
+NOMINATIVE = Template('')
+
+STEM = 0
+SOFTENED = 1
+ALTERNATE = 2
+
+def get_forms():
+  '''
+  ## forms
+  every feature bundle the analyzer knows with the template that
+  generates it. possesive forms have no case and no copula.
+  '''
+  for case in GrammaticalCase:
+    template = CASES.get(case, NOMINATIVE)
+
+    yield (case, Copula.ZERO, Person.THIRD, False), template
+    yield (case, Copula.ZERO, Person.THIRD, True), Suffix.PLURAL + template
+    yield (case, Copula.TOBE, Person.THIRD, False), template + Suffix.TOBE
+
+    for copula, endings in COPULAS.items():
+      if copula in (Copula.ZERO, Copula.TOBE):
+        continue
+
+      for (person, is_plural), ending in endings.items():
+        yield (case, copula, person, is_plural), template + ending
+
+  for (person, is_plural), template in POSSESSIVE.items():
+    yield (None, None, person, is_plural), template
+
+FEATURES, TEMPLATES = zip(*get_forms())
+
+PRONOMINAL = frozenset(
+  code
+  for code, (case, copula, _, is_plural) in enumerate(FEATURES)
+  if case == GrammaticalCase.NOMINATIVE
+  and not (copula == Copula.ZERO and is_plural)
+)
+
+def build_suffix_index():
+  index = {}
+
+  for code, template in enumerate(TEMPLATES):
+    for key in KEYS:
+      softens, suffix, _ = template.table[key]
+      index.setdefault(suffix, {}).setdefault(key, []).append(
+        code << 2 | template.alternates[key] << 1 | softens
+      )
+
+  return {
+    suffix: {key: tuple(codes) for key, codes in classes.items()}
+    for suffix, classes in index.items()
+  }
+
+SUFFIXES = build_suffix_index()
+
+class Analyzer:
+  '''
+  ## analyzer
+  ✎︎ tests
+  ```python
+  >>> analyzer = Analyzer(['dal', 'kitap', 'elma'])
+  >>> analyzer.analyze('daldaydık')
+  [Reading(stem='dal', case=<GrammaticalCase.LOCATIVE: 6>, copula=<Copula.PERFECTIVE: 'perfective'>, person=<Person.FIRST: 'first'>, is_plural=True)]
+
+  >>> [(reading.case, reading.copula) for reading in analyzer.analyze('kitabı')]
+  [(<GrammaticalCase.ACCUSATIVE: 4>, <Copula.ZERO: 'zero'>), (<GrammaticalCase.ACCUSATIVE: 4>, <Copula.PERSONAL: 'personal'>), (None, None)]
+
+  >>> analyzer.analyze('elmalar')[0].is_plural
+  True
+
+  >>> analyzer.analyze('armut')
+  []
+
+  >>> analyzer = Analyzer(['burun', 'hak', 'akıl', 'top'])
+  >>> [reading.stem for word in ('burnu', 'hakkı', 'aklı', 'topu', 'burunda') for reading in analyzer.analyze(word)[:1]]
+  ['burun', 'hak', 'akıl', 'top', 'burun']
+  >>> analyzer.analyze('burunu'), analyzer.analyze('tobu')
+  ([], [])
+
+  >>> analyzer = Analyzer(['ben'])
+  >>> [(reading.case.name, reading.copula.value) for reading in analyzer.analyze('banaydım')]
+  [('DATIVE', 'perfective')]
+  >>> analyzer.analyze('bene')
+  []
+
+  ```
+  '''
+  __slots__ = ('stems', 'keys', 'alternates', 'cases', 'bases')
+
+  def __init__(self, stems=()):
+    self.stems = []
+    self.keys = array('B')
+    self.alternates = array('B')
+    self.cases = array('B')
+    self.bases = {}
+
+    for stem in stems:
+      self.add(stem)
+
+  def __len__(self):
+    return len(self.stems)
+
+  def add(self, stem):
+    if stem in PRONOUNS:
+      for case in GrammaticalCase:
+        self.insert(stem, decline(stem, False, case), case.value)
+    else:
+      self.insert(stem, stem)
+
+  def insert(self, stem, form, case=0):
+    try:
+      profile = analyze(form)
+    except MissingVowelSound:
+      return
+
+    number = len(self.stems)
+    self.stems.append(stem)
+    self.keys.append(profile.key)
+    self.alternates.append(profile.alternate is not None)
+    self.cases.append(case)
+
+    self.index(form, number << 2 | STEM)
+
+    if profile.can_soften:
+      self.index(voice(form), number << 2 | SOFTENED)
+
+    if profile.alternate is not None:
+      self.index(profile.alternate, number << 2 | ALTERNATE)
+
+  def index(self, base, entry):
+    entries = self.bases.get(base)
+
+    if entries is None:
+      self.bases[base] = entry
+    elif isinstance(entries, int):
+      self.bases[base] = (entries, entry)
+    else:
+      self.bases[base] = (*entries, entry)
+
+  def analyze(self, surface):
+    readings = []
+
+    for split in range(1, len(surface) + 1):
+      suffixes = SUFFIXES.get(surface[split:])
+
+      if suffixes is None:
+        continue
+
+      entries = self.bases.get(surface[:split])
+
+      if entries is None:
+        continue
+
+      if isinstance(entries, int):
+        entries = (entries,)
+
+      for entry in entries:
+        number = entry >> 2
+        alternates = self.alternates[number]
+        case = self.cases[number]
+
+        for code in suffixes.get(self.keys[number], ()):
+          base = ALTERNATE if alternates and code & 2 else code & 1
+
+          if base != entry & 3:
+            continue
+
+          if not case:
+            readings.append(Reading(self.stems[number], *FEATURES[code >> 2]))
+          elif code >> 2 in PRONOMINAL:
+            readings.append(Reading(
+              self.stems[number],
+              GrammaticalCase(case),
+              *FEATURES[code >> 2][1:],
+            ))
+
+    return readings
@@ -0,0 +1,594 @@
+'''
+# Batch Inflection
+
+Inflecting one (stem, case, person, copula, plural) request at a time
+pays for resolving the enums and dispatching to the processors on every
+call. `inflect_many` reads requests in chunks, resolves every distinct
+plan once and analyses every distinct stem once, then applies the plans
+with a table lookup per form.
+
+With `workers` above one, chunks are spread over a process pool whose
+workers resolve every plan up front. Results come back in input order,
+at most `WINDOW` chunks per worker are in flight so memory does not
+grow with the input, and unless a chunk size is given it is tuned so
+that a chunk takes about `CHUNK_DURATION` seconds in a worker.
+'''
+import time
+from collections import deque, namedtuple
+from collections.abc import Mapping
+from functools import lru_cache, partial
+from itertools import islice, product
+from multiprocessing import Pool
+
+from .functional import join, identity, get_enum_member
+from .irregular import IRREGULARS
+from .phonology import analyze, voice, get_regular_key
+from .normalization import get_token
+from .predication import Person, Copula, COPULAS, get_copula_processor
+from .pronoun import PRONOUNS, decline
+from .subject import GrammaticalCase, CASES, get_case_processor
+from .suffix import Template
+
+NOMINATIVE = Template('')
+
+CHUNK_SIZE = 4096
+MIN_CHUNK_SIZE = 256
+MAX_CHUNK_SIZE = 1 << 16
+CHUNK_DURATION = 0.05
+WINDOW = 2
+
+Inflection = namedtuple(
+  'Inflection',
+  ('stem', 'case', 'person', 'copula', 'is_plural'),
+  defaults=(
+    GrammaticalCase.NOMINATIVE,
+    Person.THIRD,
+    Copula.ZERO,
+    False,
+  ),
+)
+
+def get_case(case):
+  if case is None:
+    return GrammaticalCase.NOMINATIVE
+  if isinstance(case, str):
+    return GrammaticalCase.__members__.get(case.upper())
+  if isinstance(case, int):
+    try:
+      return GrammaticalCase(case)
+    except ValueError:
+      return None
+  return case
+
+def get_person(person):
+  if person is None:
+    return Person.THIRD
+  if isinstance(person, str):
+    return get_enum_member(Person, person)
+  return person
+
+def get_copula(copula):
+  if copula is None:
+    return Copula.ZERO
+  if isinstance(copula, str):
+    return get_enum_member(Copula, copula)
+  if isinstance(copula, tuple):
+    return tuple(map(get_copula, copula))
+  return copula
+
+NUMBERS = {
+  '': False, '0': False, 'false': False, 'no': False, 'singular': False,
+  '1': True, 'true': True, 'yes': True, 'plural': True,
+}
+
+def get_number(is_plural):
+  if is_plural is None:
+    return False
+  if isinstance(is_plural, bool):
+    return is_plural
+  if isinstance(is_plural, str):
+    return NUMBERS.get(is_plural.strip().lower())
+  if is_plural in (0, 1):
+    return bool(is_plural)
+
+class Plan:
+  '''
+  ## plan
+  a resolved (case, person, copula, plural) request. when the case
+  and the copula are both suffix templates they are fused into one
+  template, otherwise the plan falls back to calling the processors.
+  a personal pronoun is declined with `kefir.pronoun` instead of
+  taking the case suffix, and a stem that is not normal is inflected
+  through `kefir.normalization`. plans compare and hash by the request
+  they resolve.
+  '''
+  __slots__ = (
+    'key',
+    'template',
+    'table',
+    'alternates',
+    'function',
+    'pronoun',
+  )
+
+  def __init__(self, key, template=None, function=identity):
+    self.key = key
+    self.template = template
+    self.table = template and template.table
+    self.alternates = template and template.alternates
+    self.function = function
+    self.pronoun = None
+
+  def __eq__(self, other):
+    return isinstance(other, Plan) and self.key == other.key
+
+  def __hash__(self):
+    return hash(self.key)
+
+  def __repr__(self):
+    return 'Plan(%s)' % ', '.join(
+      feature.name.lower() if hasattr(feature, 'name') else repr(feature)
+      for feature in self.key
+    )
+
+  def __call__(self, stem):
+    token = get_token(stem)
+
+    if token is not None:
+      return token.restore(self(token.text))
+
+    if self.pronoun is not None and stem in PRONOUNS:
+      return self.pronoun(stem)
+
+    if self.table is None:
+      return self.function(stem)
+
+    profile = analyze(stem)
+    softens, suffix, _ = self.table[profile.key]
+
+    if profile.alternate is not None and self.alternates[profile.key]:
+      return join(profile.alternate, suffix)
+
+    return join(voice(stem) if softens else stem, suffix)
+
+@lru_cache(maxsize=None)
+def get_plan(case, person, copula, is_plural):
+  case = get_case(case)
+  person = get_person(person)
+  copula = get_copula(copula)
+  is_plural = get_number(is_plural)
+
+  if case is None:
+    raise Exception('invalid case. options: %s' % GrammaticalCase)
+
+  if person is None:
+    raise Exception('invalid person. options: %s' % Person)
+
+  if copula is None:
+    raise Exception('invalid copula. options: %s' % Copula)
+
+  if is_plural is None:
+    raise Exception('invalid plural. options: %s' % ', '.join(
+      filter(None, NUMBERS),
+    ))
+
+  copulas = copula if isinstance(copula, tuple) else (copula,)
+
+  if None in copulas:
+    raise Exception('invalid copula. options: %s' % Copula)
+
+  return build_plan(
+    (case, person, copula, is_plural),
+    (case, *copulas),
+    person,
+    is_plural,
+  )
+
+def get_morpheme(morpheme):
+  if isinstance(morpheme, (GrammaticalCase, Copula)):
+    return morpheme
+
+  if isinstance(morpheme, str):
+    return (
+      GrammaticalCase.__members__.get(morpheme.upper())
+      or get_enum_member(Copula, morpheme)
+    )
+
+def fuse(morphemes, person, is_plural):
+  template = NOMINATIVE
+
+  for morpheme in morphemes:
+    if isinstance(morpheme, GrammaticalCase):
+      suffix = CASES.get(morpheme, NOMINATIVE)
+    else:
+      suffix = COPULAS.get(morpheme, {}).get((person, is_plural))
+
+    if suffix is None:
+      return None
+
+    template = template + suffix
+
+  return template
+
+def compose(morphemes, person, is_plural):
+  processors = []
+
+  for morpheme in morphemes:
+    if isinstance(morpheme, GrammaticalCase):
+      processors.append(get_case_processor(morpheme))
+    else:
+      processors.append(partial(
+        lambda text, processor: processor(text, person, is_plural),
+        processor=get_copula_processor(morpheme),
+      ))
+
+  def function(stem):
+    for processor in processors:
+      stem = processor(stem)
+
+    return stem
+
+  return function
+
+def get_declension(case, plan):
+  def declension(pronoun):
+    return plan(decline(pronoun, False, case))
+
+  return declension
+
+def build_plan(key, morphemes, person, is_plural):
+  plan = fuse_plan(key, morphemes, person, is_plural)
+  case, *rest = morphemes
+
+  if isinstance(case, GrammaticalCase) and case != GrammaticalCase.NOMINATIVE:
+    plan.pronoun = get_declension(case, fuse_plan(key, rest, person, is_plural))
+
+  return plan
+
+def fuse_plan(key, morphemes, person, is_plural):
+  template = fuse(morphemes, person, is_plural)
+
+  if template is None:
+    return Plan(key, function=compose(morphemes, person, is_plural))
+
+  if template.source:
+    return Plan(key, template)
+
+  return Plan(key)
+
+@lru_cache(maxsize=None)
+def get_chain(morphemes, person, is_plural):
+  resolved = tuple(map(get_morpheme, morphemes))
+  person = get_person(person)
+  is_plural = get_number(is_plural)
+
+  if None in resolved:
+    raise Exception('invalid morpheme. options: %s, %s' % (
+      GrammaticalCase,
+      Copula,
+    ))
+
+  if person is None:
+    raise Exception('invalid person. options: %s' % Person)
+
+  if is_plural is None:
+    raise Exception('invalid plural. options: %s' % ', '.join(
+      filter(None, NUMBERS),
+    ))
+
+  return build_plan((resolved, person, is_plural), resolved, person, is_plural)
+
+def compile_chain(morphemes, person=Person.THIRD, is_plural=False):
+  '''
+  ## compile_chain
+  compiles a chain of cases and copulas, applied left to right with
+  the same person and number as nested `predicate` calls would, into
+  one plan. the suffix tables of the chain are fused ahead of time,
+  so a stem is analysed once and the phonological state is carried
+  from one morpheme to the next instead of rescanning the word.
+
+  ✎︎ tests
+  ```python
+  >>> chain = compile_chain(('locative', 'progressive', 'perfective'), 'first', True)
+  >>> chain('marul')
+  'maruldamaktayızdık'
+
+  >>> from kefir import locative, predicate, subject
+  >>> chain('marul') == predicate(
+  ...   locative('marul'),
+  ...   'first',
+  ...   (Copula.PROGRESSIVE, Copula.PERFECTIVE),
+  ...   True,
+  ... )
+  True
+  >>> chain.template
+  Template('-DA-mAktA-(y)Iz-(y)DIk')
+  >>> chain('ben'), chain('biz')
+  ('bendemekteyizdik', 'bizdemekteyizdik')
+  >>> all(
+  ...   compile_chain((case, 'perfective'), 'first', True)(pronoun)
+  ...   == predicate(subject(pronoun, case=case), 'first', 'perfective', True)
+  ...   for pronoun in ('ben', 'sen', 'o', 'biz', 'siz', 'onlar')
+  ...   for case in ('genitive', 'dative', 'accusative', 'ablative', 'locative')
+  ... )
+  True
+
+  ```
+  '''
+  return get_chain(tuple(morphemes), person, is_plural)
+
+def compile_predicate(
+  person=Person.THIRD,
+  copula=Copula.ZERO,
+  is_plural=False,
+):
+  '''
+  ## compile_predicate
+  resolves the arguments of `predicate` once and returns a cached,
+  hashable plan that applies them to a stem, so applying it costs a
+  table lookup.
+
+  ✎︎ tests
+  ```python
+  >>> first = compile_predicate('first', 'perfective', True)
+  >>> first('dal'), first('gel'), first('kitap')
+  ('daldık', 'geldik', 'kitaptık')
+  >>> first
+  Plan(nominative, first, perfective, True)
+  >>> first == compile_predicate(Person.FIRST, Copula.PERFECTIVE, True)
+  True
+  >>> compile_predicate(copula='negative')('yolcu')
+  'yolcu değil'
+  >>> first('ANKARA'), first('2024')
+  ('ANKARAYDIK', "2024'tük")
+
+  ```
+  '''
+  return get_plan(GrammaticalCase.NOMINATIVE, person, copula, is_plural)
+
+FEATURES = Inflection._fields[1:]
+FIELDS = len(Inflection._fields)
+
+def get_request(request):
+  if type(request) is tuple and len(request) == FIELDS:
+    return request[0], request[1:]
+
+  if isinstance(request, str):
+    return request, (None,) * len(FEATURES)
+
+  if isinstance(request, Mapping):
+    return request['stem'], tuple(map(request.get, FEATURES))
+
+  stem, *features = request
+  return stem, (*features, *(None,) * (len(FEATURES) - len(features)))
+
+def get_features(features):
+  '''
+  ## get_features
+  features with a copula chain given as a list, as json gives it,
+  turned hashable. only called once hashing the features has failed.
+
+  ✎︎ tests
+  ```python
+  >>> get_features(('locative', 'first', ['progressive', 'perfective'], True))
+  ('locative', 'first', ('progressive', 'perfective'), True)
+
+  ```
+  '''
+  return tuple(
+    tuple(feature) if isinstance(feature, list) else feature
+    for feature in features
+  )
+
+def chunked(iterable, size):
+  iterator = iter(iterable)
+
+  while True:
+    chunk = list(islice(iterator, size))
+
+    if not chunk:
+      return
+
+    yield chunk
+
+def inflect_one(inflect, request):
+  try:
+    return next(inflect((request,)))
+  except Exception as error:
+    return error
+
+def inflect_safely(inflect, requests, chunk_size):
+  '''
+  ## inflect_safely
+  inflects a chunk at a time with `inflect`, and a request at a time
+  in a chunk that fails, giving the exception of a failed request in
+  place of its form.
+  '''
+  for chunk in chunked(requests, chunk_size or CHUNK_SIZE):
+    try:
+      forms = list(inflect(chunk, len(chunk)))
+    except Exception:
+      forms = [inflect_one(inflect, request) for request in chunk]
+
+    yield from forms
+
+def inflect_many(
+  requests,
+  chunk_size=None,
+  workers=1,
+  return_exceptions=False,
+):
+  '''
+  ## inflect_many
+  inflects an iterable of requests and yields the forms in input
+  order. a request is a stem, an `Inflection`, a tuple in the same
+  field order or a mapping with the same keys; fields left out fall
+  back to the nominative, third person, zero copula and singular.
+  a personal pronoun in a case other than the nominative is declined
+  as `subject` declines it. the plural of a request is the number of
+  its person and not of the noun, so a plural pronoun is a stem of its
+  own (biz, onlar).
+  `workers` above one inflects chunks in that many processes. with
+  `return_exceptions` a request that fails gives its exception in
+  place of its form instead of ending the iteration.
+
+  ✎︎ tests
+  ```python
+  >>> list(inflect_many([
+  ...   ('dal', 'locative', 'first', 'perfective', True),
+  ...   Inflection('gel', copula=Copula.FUTURE),
+  ...   {'stem': 'kitap', 'case': GrammaticalCase.DATIVE},
+  ...   'yolcu',
+  ... ]))
+  ['daldaydık', 'gelecek', 'kitaba', 'yolcu']
+
+  >>> list(inflect_many([
+  ...   ('ben', 'dative'),
+  ...   ('ben', 'dative', None, None, True),
+  ...   ('onlar', 'genitive'),
+  ... ]))
+  ['bana', 'bana', 'onların']
+  >>> from kefir import predicate, subject
+  >>> pronouns = [
+  ...   (pronoun, case, 'second', 'conditional', True)
+  ...   for pronoun in ('ben', 'sen', 'o', 'biz', 'siz', 'onlar')
+  ...   for case in ('dative', 'ablative', 'locative')
+  ... ]
+  >>> list(inflect_many(pronouns)) == [
+  ...   predicate(subject(pronoun, case=case), person, copula, is_plural)
+  ...   for pronoun, case, person, copula, is_plural in pronouns
+  ... ]
+  True
+  >>> list(inflect_many([{'stem': 'gel', 'copula': ['progressive', 'perfective']}]))
+  ['gelmekteydi']
+
+  >>> list(inflect_many(['kitap', ('ev', 'locative')] * 2, workers=2))
+  ['kitap', 'evde', 'kitap', 'evde']
+
+  >>> list(inflect_many(
+  ...   [('ev', 'locative'), ('ev', 'elative'), ('ev', None, None, None, 'false')],
+  ...   return_exceptions=True,
+  ... ))
+  ['evde', Exception("invalid case. options: <enum 'GrammaticalCase'>"), 'ev']
+  >>> list(inflect_many([('ev', 6), ('ev', 9)], return_exceptions=True))
+  ['evde', Exception("invalid case. options: <enum 'GrammaticalCase'>")]
+
+  ```
+  '''
+  if workers > 1:
+    return inflect_parallel(requests, chunk_size, workers, return_exceptions)
+
+  if return_exceptions:
+    return inflect_safely(inflect_serial, requests, chunk_size)
+
+  return inflect_serial(requests, chunk_size)
+
+def inflect_serial(requests, chunk_size=None):
+  plans = {}
+
+  for chunk in chunked(requests, chunk_size or CHUNK_SIZE):
+    keys = {}
+
+    for stem, features in map(get_request, chunk):
+      try:
+        plan = plans.get(features)
+      except TypeError:
+        features = get_features(features)
+        plan = plans.get(features)
+
+      if plan is None:
+        plan = plans[features] = get_plan(*features)
+
+      if plan.table is None:
+        yield plan(stem)
+        continue
+
+      key = keys.get(stem)
+
+      if key is None:
+        if (
+          stem in IRREGULARS
+          or stem in PRONOUNS
+          or type(stem) is not str
+          or not (stem.isalpha() and stem.islower())
+        ):
+          yield plan(stem)
+          continue
+
+        key = get_regular_key(stem)
+
+        if key is None:
+          yield plan(stem)
+          continue
+
+        keys[stem] = key
+
+      softens, suffix, _ = plan.table[key]
+      yield (voice(stem) if softens else stem) + suffix
+
+def warm():
+  for features in product(
+    GrammaticalCase,
+    Person,
+    Copula,
+    (False, True),
+  ):
+    get_plan(*features)
+
+def inflect_chunk(chunk, return_exceptions=False):
+  started = time.perf_counter()
+  forms = list(inflect_many(
+    chunk,
+    len(chunk),
+    return_exceptions=return_exceptions,
+  ))
+  return forms, time.perf_counter() - started
+
+def tune(size, count, elapsed):
+  '''
+  ## tune
+  the size of the next chunk, halfway from `size` to the size that
+  takes `CHUNK_DURATION` at the rate of the last chunk, so one slow
+  or fast chunk does not swing it.
+
+  ✎︎ tests
+  ```python
+  >>> tune(4096, 4096, 0.025), tune(4096, 4096, 0.1), tune(4096, 4096, 0)
+  (6144, 3072, 34816)
+
+  ```
+  '''
+  if elapsed:
+    target = int(CHUNK_DURATION * count / elapsed)
+  else:
+    target = MAX_CHUNK_SIZE
+
+  return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, (size + target) // 2))
+
+def inflect_parallel(requests, chunk_size, workers, return_exceptions=False):
+  requests = iter(requests)
+  size = chunk_size or CHUNK_SIZE
+  pending = deque()
+
+  with Pool(workers, initializer=warm) as pool:
+    while True:
+      while len(pending) < workers * WINDOW:
+        chunk = list(islice(requests, size))
+
+        if not chunk:
+          break
+
+        pending.append(pool.apply_async(
+          inflect_chunk,
+          (chunk, return_exceptions),
+        ))
+
+      if not pending:
+        return
+
+      forms, elapsed = pending.popleft().get()
+
+      if chunk_size is None:
+        size = tune(size, len(forms), elapsed)
+
+      yield from forms
@@ -0,0 +1,169 @@
+'''
+# Derivation
+
+The copulas that may follow each other form a small graph: an aspect
+(progressive, imperfective, future, necessitative, impotential) comes
+right after the stem and may be followed by the past, the condition,
+the generalizing -DIr or değil; the past and the condition may follow
+each other once (geldiyse, gelseydi). A copula is never repeated, so
+the chains are the paths of a directed acyclic graph rooted at the
+stem.
+
+The paths up to a depth are unfolded into a tree once per person and
+number, each node holding the step that attaches its copula. `derive`
+walks that tree depth first for a stem and yields a `Derivation` for
+every chain as soon as it is reached, shortest first along each path.
+A node is its parent's form and class key with one suffix table
+lookup applied: chains that share a prefix share its form, and no
+word is analysed again after the stem.
+'''
+from collections import namedtuple
+from functools import lru_cache
+
+from .batch import NUMBERS, get_person, get_number
+from .normalization import get_token
+from .phonology import analyze, voice
+from .predication import Person, Copula, COPULAS, get_copula_processor
+
+MAX_DEPTH = 4
+
+ENDINGS = (Copula.PERFECTIVE, Copula.CONDITIONAL, Copula.TOBE)
+
+DERIVATIONS = {
+  None: (
+    Copula.PROGRESSIVE,
+    Copula.IMPERFECTIVE,
+    Copula.FUTURE,
+    Copula.NECESSITATIVE,
+    Copula.IMPOTENTIAL,
+    Copula.NEGATIVE,
+    Copula.PERSONAL,
+    *ENDINGS,
+  ),
+  Copula.PROGRESSIVE: (Copula.NEGATIVE, *ENDINGS),
+  Copula.IMPERFECTIVE: ENDINGS,
+  Copula.FUTURE: (Copula.NEGATIVE, *ENDINGS),
+  Copula.NECESSITATIVE: (Copula.NEGATIVE, *ENDINGS),
+  Copula.IMPOTENTIAL: ENDINGS,
+  Copula.NEGATIVE: (Copula.PERSONAL, *ENDINGS),
+  Copula.PERSONAL: (),
+  Copula.PERFECTIVE: (Copula.CONDITIONAL,),
+  Copula.CONDITIONAL: (Copula.PERFECTIVE,),
+  Copula.TOBE: (),
+}
+
+Derivation = namedtuple('Derivation', ('chain', 'form'))
+
+@lru_cache(maxsize=None)
+def get_steps(person, is_plural):
+  '''
+  a function for every copula that takes the form, the class key and
+  the alternate of a node to the form and the class key of its child.
+  copulas without a suffix table call their processor and analyse
+  what it gives.
+  '''
+  steps = {}
+
+  for copula in DERIVATIONS[None]:
+    template = COPULAS.get(copula, {}).get((person, is_plural))
+
+    if template is None:
+      def step(form, key, alternate, processor=get_copula_processor(copula)):
+        form = processor(form, person, is_plural)
+        return form, analyze(form).key
+    else:
+      def step(
+        form,
+        key,
+        alternate,
+        table=template.table,
+        alternates=template.alternates,
+      ):
+        softens, suffix, next_key = table[key]
+
+        if alternate is not None and alternates[key]:
+          return alternate + suffix, next_key
+
+        return (voice(form) if softens else form) + suffix, next_key
+
+    steps[copula] = step
+
+  return steps
+
+def build_paths(steps, chain, depth):
+  if len(chain) >= depth:
+    return ()
+
+  return tuple(reversed([
+    ((*chain, copula), steps[copula], build_paths(steps, (*chain, copula), depth))
+    for copula in DERIVATIONS[chain[-1] if chain else None]
+    if copula not in chain
+  ]))
+
+@lru_cache(maxsize=None)
+def get_paths(person, is_plural, depth):
+  '''
+  the tree of chains up to `depth` copulas long, as (chain, step,
+  children) nodes with the children in reverse order.
+  '''
+  return build_paths(get_steps(person, is_plural), (), depth)
+
+def derive(stem, person=Person.THIRD, is_plural=False, depth=MAX_DEPTH):
+  '''
+  ## derive
+  the chains of copulas a stem takes, up to `depth` copulas long,
+  as (chain, form) pairs. the forms are the ones `predicate` gives
+  for the same chain.
+
+  ✎︎ tests
+  ```python
+  >>> for chain, form in derive('dal', depth=2):
+  ...   if chain[0] == Copula.PROGRESSIVE:
+  ...     print(' '.join(copula.value for copula in chain), form)
+  progressive dalmakta
+  progressive negative dalmakta değil
+  progressive perfective dalmaktaydı
+  progressive conditional dalmaktaysa
+  progressive tobe dalmaktadır
+
+  >>> from kefir import predicate
+  >>> all(
+  ...   form == predicate('kitap', 'first', chain, True)
+  ...   for chain, form in derive('kitap', 'first', True)
+  ... )
+  True
+  >>> len(list(derive('kitap'))), len(list(derive('kitap', depth=1)))
+  (64, 10)
+
+  ```
+  '''
+  person = get_person(person)
+  is_plural = get_number(is_plural)
+
+  if person is None:
+    raise Exception('invalid person. options: %s' % Person)
+
+  if is_plural is None:
+    raise Exception('invalid plural. options: %s' % ', '.join(
+      filter(None, NUMBERS),
+    ))
+
+  token = get_token(stem)
+
+  if token is not None:
+    stem = token.text
+
+  profile = analyze(stem)
+  stack = [
+    (path, stem, profile.key, profile.alternate)
+    for path in get_paths(person, is_plural, depth)
+  ]
+
+  while stack:
+    (chain, step, children), form, key, alternate = stack.pop()
+    form, key = step(form, key, alternate)
+
+    yield Derivation(chain, token.restore(form) if token else form)
+
+    for path in children:
+      stack.append((path, form, key, None))
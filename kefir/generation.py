@@ -0,0 +1,103 @@
+'''
+# Sentence Generation
+
+Every pairing of a list of subjects with a list of predicates, as a
+stream. Both sides are inflected once with `inflect_many`: the
+predicates are kept in memory, the subjects are read lazily, so
+memory grows with the number of predicates and not with the size of
+the product. The number of a subject is the number of the noun, as
+`subject` takes it, and its copula agrees with it.
+
+Sentences are numbered subject by subject, so the sentence at index
+`i` pairs subject `i // len(predicates)` with predicate
+`i % len(predicates)`. `start` and `stop` select a range of that
+numbering without inflecting the subjects before it, and `get_shard`
+splits the whole product into ranges that do not overlap.
+'''
+from itertools import islice
+
+from .batch import NUMBERS, get_number, get_request, inflect_many
+from .subject import subject
+
+def get_shard(total, index, count):
+  '''
+  ## get_shard
+  the (start, stop) range of shard `index` out of `count` shards of
+  `total` sentences. the shards cover the product exactly once and
+  differ in size by at most one.
+
+  ✎︎ tests
+  ```python
+  >>> [get_shard(10, index, 3) for index in range(3)]
+  [(0, 3), (3, 6), (6, 10)]
+
+  ```
+  '''
+  if not 0 <= index < count:
+    raise Exception('invalid shard %d. options: 0 to %d' % (index, count - 1))
+
+  return index * total // count, (index + 1) * total // count
+
+def get_subject(request):
+  stem, (case, person, copula, is_plural) = get_request(request)
+  number = get_number(is_plural)
+
+  if number is None:
+    raise Exception('invalid plural. options: %s' % ', '.join(
+      filter(None, NUMBERS),
+    ))
+
+  if number:
+    stem = subject(stem, True)
+
+  return stem, case, person, copula, number
+
+def sentences(subjects, predicates, delimiter=' ', start=0, stop=None):
+  '''
+  ## sentences
+  subjects and predicates are requests as `inflect_many` takes them,
+  but a plural subject is a plural noun, so çocuk in the locative
+  and the plural is çocuklarda.
+
+  ✎︎ tests
+  ```python
+  >>> subjects = ['yakup', ('ev', 'locative')]
+  >>> predicates = [('gel', 'nominative', 'third', 'perfective'), 'yolcu']
+  >>> list(sentences(subjects, predicates))
+  ['yakup geldi', 'yakup yolcu', 'evde geldi', 'evde yolcu']
+
+  >>> list(sentences(subjects, predicates, start=1, stop=3))
+  ['yakup yolcu', 'evde geldi']
+
+  >>> subjects = [
+  ...   {'stem': 'ev', 'is_plural': True},
+  ...   ('çocuk', 'locative', None, None, True),
+  ...   ('ben', 'dative', None, None, True),
+  ... ]
+  >>> list(sentences(subjects, ['geldi']))
+  ['evler geldi', 'çocuklarda geldi', 'bize geldi']
+
+  ```
+  '''
+  predicates = list(inflect_many(predicates))
+  width = len(predicates)
+
+  if not width or (stop is not None and stop <= start):
+    return
+
+  first = start // width
+  last = None if stop is None else -(-stop // width)
+
+  for row, subject in enumerate(
+    inflect_many(map(get_subject, islice(subjects, first, last))),
+    first,
+  ):
+    offset = row * width
+    prefix = subject + delimiter
+
+    for predicate in islice(
+      predicates,
+      max(start - offset, 0),
+      width if stop is None else min(stop - offset, width),
+    ):
+      yield prefix + predicate
@@ -0,0 +1,368 @@
+'''
+# Instrumentation
+
+Opt-in counters for the case and copula processors: calls, inclusive
+time and exceptions raised (`MissingVowelSound` among them) for every
+processor, and the hit rates of the stem profile and batch plan
+caches.
+
+The compiled paths that do not go through the processors are counted
+too: plan applications, paradigm cells filled, and the forms yielded
+by `inflect_many` and `derive` (for these generators a call is one
+form, and its time is the time taken to produce it).
+
+Enable it for the whole process with `KEFIR_INSTRUMENT=1` in the
+environment, or for a block with `instrumented()`. Enabling replaces
+the processors, everywhere kefir refers to them, with counting
+wrappers; disabling puts the originals back. Both clear the plan
+caches, so no plan keeps calling the processors it was built with.
+While it is disabled nothing is wrapped, so it costs nothing.
+
+Read the counters with `snapshot()` as a dict, or with `prometheus()`
+in the Prometheus text exposition format.
+'''
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from importlib import import_module
+from time import perf_counter
+
+ENVIRONMENT_VARIABLE = 'KEFIR_INSTRUMENT'
+
+PROCESSORS = {
+  'kefir.subject': (
+    'nominative',
+    'genitive',
+    'dative',
+    'accusative',
+    'ablative',
+    'locative',
+    'possesive',
+    'subject',
+  ),
+  'kefir.predication': (
+    'negative',
+    'zero',
+    'tobe',
+    'personal',
+    'inferential',
+    'conditional',
+    'perfective',
+    'imperfective',
+    'future',
+    'progressive',
+    'necessitative',
+    'impotential',
+    'combinator',
+    'predicate',
+  ),
+}
+
+ITERATORS = {
+  'kefir.batch': ('inflect_many',),
+  'kefir.derivation': ('derive',),
+}
+
+METHODS = {
+  'kefir.batch': (('Plan', '__call__'),),
+  'kefir.paradigm': (('Paradigm', 'inflect'),),
+}
+
+CACHES = {
+  'analyze': ('kefir.phonology', 'analyze'),
+  'plan': ('kefir.batch', 'get_plan'),
+  'chain': ('kefir.batch', 'get_chain'),
+}
+
+PLANS = (
+  ('kefir.batch', 'get_plan'),
+  ('kefir.batch', 'get_chain'),
+  ('kefir.derivation', 'get_steps'),
+  ('kefir.derivation', 'get_paths'),
+)
+
+class Stats:
+  __slots__ = ('calls', 'seconds', 'exceptions')
+
+  def __init__(self):
+    self.calls = 0
+    self.seconds = 0.0
+    self.exceptions = Counter()
+
+STATS = {}
+WRAPPERS = {}
+OWNERS = {}
+BASELINES = {}
+
+def get_name(module, name):
+  return '%s.%s' % (module.rsplit('.', 1)[-1], name)
+
+def wrap(name, function):
+  stats = STATS.setdefault(name, Stats())
+
+  @wraps(function)
+  def wrapper(*args, **kwargs):
+    started = perf_counter()
+
+    try:
+      return function(*args, **kwargs)
+    except Exception as error:
+      stats.exceptions[type(error).__name__] += 1
+      raise
+    finally:
+      stats.calls += 1
+      stats.seconds += perf_counter() - started
+
+  return wrapper
+
+def wrap_iterator(name, function):
+  stats = STATS.setdefault(name, Stats())
+
+  @wraps(function)
+  def wrapper(*args, **kwargs):
+    iterator = iter(function(*args, **kwargs))
+
+    while True:
+      started = perf_counter()
+
+      try:
+        item = next(iterator)
+      except StopIteration:
+        return
+      except Exception as error:
+        stats.exceptions[type(error).__name__] += 1
+        raise
+      finally:
+        stats.seconds += perf_counter() - started
+
+      stats.calls += 1
+      yield item
+
+  return wrapper
+
+def get_modules():
+  return [
+    module
+    for name, module in list(sys.modules.items())
+    if module is not None and (name == 'kefir' or name.startswith('kefir.'))
+  ]
+
+def replace(replacements):
+  for module in get_modules():
+    for attribute, value in list(vars(module).items()):
+      replacement = replacements.get(id(value))
+
+      if replacement is not None and value is replacement[0]:
+        setattr(module, attribute, replacement[1])
+
+def get_cache_info(name):
+  module, attribute = CACHES[name]
+  return getattr(import_module(module), attribute).cache_info()
+
+def clear_plans():
+  for name, cache in CACHES.items():
+    if cache in PLANS and name in BASELINES:
+      info = get_cache_info(name)
+      hits, misses = BASELINES[name]
+      BASELINES[name] = hits - info.hits, misses - info.misses
+
+  for module, attribute in PLANS:
+    getattr(import_module(module), attribute).cache_clear()
+
+def is_enabled():
+  return bool(WRAPPERS)
+
+def enable():
+  if WRAPPERS:
+    return
+
+  for module, names in PROCESSORS.items():
+    for name in names:
+      function = getattr(import_module(module), name)
+      WRAPPERS[get_name(module, name)] = function, wrap(
+        get_name(module, name),
+        function,
+      )
+
+  for module, names in ITERATORS.items():
+    for name in names:
+      function = getattr(import_module(module), name)
+      WRAPPERS[get_name(module, name)] = function, wrap_iterator(
+        get_name(module, name),
+        function,
+      )
+
+  for module, methods in METHODS.items():
+    for owner, method in methods:
+      name = get_name(module, '%s.%s' % (owner, method))
+      owner = getattr(import_module(module), owner)
+      function = vars(owner)[method]
+      WRAPPERS[name] = function, wrap(name, function)
+      OWNERS[name] = owner, method
+      setattr(owner, method, WRAPPERS[name][1])
+
+  for name in CACHES:
+    info = get_cache_info(name)
+    BASELINES[name] = info.hits, info.misses
+
+  replace({
+    id(function): (function, wrapper)
+    for function, wrapper in WRAPPERS.values()
+  })
+  clear_plans()
+
+def disable():
+  replace({
+    id(wrapper): (wrapper, function)
+    for function, wrapper in WRAPPERS.values()
+  })
+
+  for name, (owner, method) in OWNERS.items():
+    setattr(owner, method, WRAPPERS[name][0])
+
+  OWNERS.clear()
+  WRAPPERS.clear()
+  clear_plans()
+
+def reset():
+  STATS.clear()
+
+  for name in BASELINES:
+    info = get_cache_info(name)
+    BASELINES[name] = info.hits, info.misses
+
+@contextmanager
+def instrumented():
+  '''
+  ## instrumented
+  enables instrumentation for the block, unless it was enabled
+  already, and disables it on the way out.
+
+  ✎︎ tests
+  ```python
+  >>> predication = import_module('kefir.predication')
+  >>> original = predication.perfective
+  >>> reset()
+  >>> with instrumented():
+  ...   predication.predicate('kitap', 'first', 'perfective')
+  ...   predication.perfective is original
+  'kitaptım'
+  False
+  >>> predication.perfective is original
+  True
+
+  >>> processors = snapshot()['processors']
+  >>> processors['predication.perfective']['calls']
+  1
+  >>> processors['predication.predicate']['calls']
+  1
+
+  >>> batch = import_module('kefir.batch')
+  >>> reset()
+  >>> with instrumented():
+  ...   list(batch.inflect_many(['kitap', ('ev', 'locative')]))
+  ...   batch.compile_predicate('first', 'negative')('kitap')
+  ['kitap', 'evde']
+  'kitap değil'
+  >>> processors = snapshot()['processors']
+  >>> processors['batch.inflect_many']['calls'], processors['batch.Plan.__call__']['calls']
+  (2, 2)
+  >>> processors['predication.negative']['calls']
+  1
+
+  ```
+  '''
+  if is_enabled():
+    yield
+    return
+
+  enable()
+
+  try:
+    yield
+  finally:
+    disable()
+
+def snapshot():
+  caches = {}
+
+  for name in CACHES:
+    info = get_cache_info(name)
+    hits, misses = BASELINES.get(name, (0, 0))
+    hits, misses = info.hits - hits, info.misses - misses
+
+    caches[name] = {
+      'hits': hits,
+      'misses': misses,
+      'hit_rate': hits / (hits + misses) if hits + misses else None,
+      'size': info.currsize,
+    }
+
+  return {
+    'enabled': is_enabled(),
+    'processors': {
+      name: {
+        'calls': stats.calls,
+        'seconds': stats.seconds,
+        'exceptions': dict(stats.exceptions),
+      }
+      for name, stats in STATS.items()
+      if stats.calls
+    },
+    'caches': caches,
+  }
+
+METRICS = (
+  ('kefir_processor_calls_total', 'counter', 'calls per processor'),
+  ('kefir_processor_seconds_total', 'counter', 'inclusive seconds per processor'),
+  ('kefir_processor_exceptions_total', 'counter', 'exceptions raised per processor'),
+  ('kefir_cache_hits_total', 'counter', 'cache hits since enabled'),
+  ('kefir_cache_misses_total', 'counter', 'cache misses since enabled'),
+  ('kefir_cache_size', 'gauge', 'entries in the cache'),
+)
+
+def get_samples(data):
+  for name, stats in data['processors'].items():
+    labels = 'processor="%s"' % name
+    yield 'kefir_processor_calls_total', labels, stats['calls']
+    yield 'kefir_processor_seconds_total', labels, stats['seconds']
+
+    for exception, count in stats['exceptions'].items():
+      yield 'kefir_processor_exceptions_total', '%s,exception="%s"' % (
+        labels,
+        exception,
+      ), count
+
+  for name, stats in data['caches'].items():
+    labels = 'cache="%s"' % name
+    yield 'kefir_cache_hits_total', labels, stats['hits']
+    yield 'kefir_cache_misses_total', labels, stats['misses']
+    yield 'kefir_cache_size', labels, stats['size']
+
+def prometheus():
+  '''
+  ## prometheus
+  the snapshot in the prometheus text exposition format.
+  '''
+  samples = {}
+
+  for metric, labels, value in get_samples(snapshot()):
+    samples.setdefault(metric, []).append('%s{%s} %s' % (
+      metric,
+      labels,
+      repr(value),
+    ))
+
+  lines = []
+
+  for metric, kind, description in METRICS:
+    lines.append('# HELP %s %s' % (metric, description))
+    lines.append('# TYPE %s %s' % (metric, kind))
+    lines.extend(samples.get(metric, ()))
+
+  return '\n'.join(lines) + '\n'
+
+if os.environ.get(ENVIRONMENT_VARIABLE, '') not in ('', '0'):
+  enable()
@@ -0,0 +1,333 @@
+'''
+# Irregular Stems
+
+Loanwords and some monosyllables do not follow the rules of
+`kefir.phonology`, and some stems change shape before a suffix that
+starts with a vowel:
+
+  - harmony: saat → saati, gol → golü, harmonize with another vowel
+    than their last
+  - no softening: top → topu, saç → saçı, keep their final consonant
+  - vowel dropping: burun → burnu, oğul → oğlu
+  - doubling: hak → hakkı, his → hissi
+
+An irregular stem is recorded with the vowel it harmonizes with,
+whether it softens, and its alternate, the shape it takes before a
+vowel. The lexicon maps every stem to one packed integer code, the
+alternates are kept aside, so looking a stem up is one hash lookup.
+`kefir.phonology.analyze` looks every stem up before it applies the
+rules, and the suffix templates put the alternate in place of the
+stem where a softening suffix starts with a vowel.
+
+`dumps` writes the lexicon as a binary blob and `loads` reads one
+back with a single split and a dict update, so tens of thousands of
+stems load in milliseconds.
+'''
+import struct
+from array import array
+from collections import namedtuple
+
+VOWELS = 'aeıioöuü'
+
+HARMONY_MASK = 0xF
+KEEPS_FINAL = 1 << 4
+ALTERNATE_SHIFT = 5
+
+MAGIC = b'KEFIRIRR'
+HEADER = struct.Struct('<8sIII')
+DELIMITER = '\n'
+
+Irregular = namedtuple(
+  'Irregular',
+  ('stem', 'harmony', 'softens', 'alternate'),
+  defaults=(None, True, None),
+)
+
+IRREGULARS = {}
+ALTERNATES = []
+HOOKS = []
+
+def drop_vowel(stem):
+  '''
+  ## drop_vowel
+  the stem without its last vowel, as burun makes burnu.
+
+  ✎︎ tests
+  ```python
+  >>> drop_vowel('burun'), drop_vowel('oğul')
+  ('burn', 'oğl')
+
+  ```
+  '''
+  for index in range(len(stem) - 1, -1, -1):
+    if stem[index] in VOWELS:
+      return stem[:index] + stem[index + 1:]
+
+  return stem
+
+def double(stem):
+  '''
+  ## double
+  the stem with its final consonant doubled, as hak makes hakkı.
+
+  ✎︎ tests
+  ```python
+  >>> double('hak'), double('his')
+  ('hakk', 'hiss')
+
+  ```
+  '''
+  return stem + stem[-1:]
+
+def encode(harmony=None, softens=True, alternate=None, slot=0):
+  '''
+  the code of an entry. its alternate is written to `slot` of the
+  alternates when there is one, so an entry added again takes the
+  place of the old one, and appended otherwise. an entry added again
+  without an alternate empties its old slot.
+  '''
+  if harmony is not None and harmony not in VOWELS:
+    raise Exception('invalid harmony %s. options: %s' % (
+      harmony,
+      ', '.join(VOWELS),
+    ))
+
+  code = VOWELS.index(harmony) + 1 if harmony else 0
+
+  if not softens:
+    code |= KEEPS_FINAL
+
+  if alternate is not None:
+    if slot:
+      ALTERNATES[slot - 1] = alternate
+    else:
+      ALTERNATES.append(alternate)
+      slot = len(ALTERNATES)
+
+    code |= slot << ALTERNATE_SHIFT
+  elif slot:
+    ALTERNATES[slot - 1] = ''
+
+  return code
+
+def decode(stem, code, alternates=ALTERNATES):
+  harmony = code & HARMONY_MASK
+  alternate = code >> ALTERNATE_SHIFT
+
+  return Irregular(
+    stem,
+    VOWELS[harmony - 1] if harmony else None,
+    not code & KEEPS_FINAL,
+    alternates[alternate - 1] if alternate else None,
+  )
+
+def register(hook):
+  '''
+  ## register
+  calls `hook` with the stems whose entries changed whenever the
+  lexicon changes, or with `None` when it is cleared. the modules
+  that cache what they derive from the lexicon register here.
+  '''
+  HOOKS.append(hook)
+  return hook
+
+def invalidate(stems):
+  for hook in HOOKS:
+    hook(stems)
+
+def get_irregular(stem):
+  '''
+  ## get_irregular
+  the `Irregular` entry of a stem, `None` for a regular one.
+
+  ✎︎ tests
+  ```python
+  >>> get_irregular('hak')
+  Irregular(stem='hak', harmony=None, softens=True, alternate='hakk')
+  >>> get_irregular('kitap') is None
+  True
+
+  >>> from kefir import subject
+  >>> from kefir.subject import GrammaticalCase
+  >>> subject('saat', case=GrammaticalCase.ACCUSATIVE), subject('dikkat', case=GrammaticalCase.ACCUSATIVE)
+  ('saati', 'dikkati')
+
+  ```
+  '''
+  code = IRREGULARS.get(stem)
+
+  if code is None:
+    return None
+
+  return decode(stem, code)
+
+def load_irregulars(entries):
+  '''
+  ## load_irregulars
+  adds `Irregular` entries, or tuples in the same order, to the
+  lexicon. a stem added again replaces its entry.
+
+  ✎︎ tests
+  ```python
+  >>> from kefir import subject
+  >>> from kefir.subject import GrammaticalCase
+  >>> saved = dumps()
+  >>> subject('vakit', case=GrammaticalCase.ACCUSATIVE)
+  'vakidi'
+  >>> load_irregulars([('vakit', None, True, 'vakt')])
+  >>> subject('vakit', case=GrammaticalCase.ACCUSATIVE)
+  'vakti'
+  >>> count = len(ALTERNATES)
+  >>> load_irregulars([('vakit', None, True, 'vakt')])
+  >>> len(ALTERNATES) == count
+  True
+  >>> load_irregulars([('vakit',)])
+  >>> subject('vakit', case=GrammaticalCase.ACCUSATIVE), 'vakt' in ALTERNATES
+  ('vakidi', False)
+  >>> clear_irregulars()
+  >>> loads(saved)
+
+  ```
+  '''
+  stems = []
+
+  for stem, *entry in entries:
+    IRREGULARS[stem] = encode(
+      *entry,
+      slot=IRREGULARS.get(stem, 0) >> ALTERNATE_SHIFT,
+    )
+    stems.append(stem)
+
+  invalidate(stems)
+
+def add_irregular(stem, harmony=None, softens=True, alternate=None):
+  load_irregulars([(stem, harmony, softens, alternate)])
+
+def clear_irregulars():
+  IRREGULARS.clear()
+  del ALTERNATES[:]
+  invalidate(None)
+
+def dumps():
+  '''
+  ## dumps
+  the lexicon as bytes: a header, the codes as an array of unsigned
+  integers, then the stems and the alternates, each joined by
+  newlines.
+  '''
+  codes = array('I', IRREGULARS.values())
+  stems = DELIMITER.join(IRREGULARS).encode('utf-8')
+  alternates = DELIMITER.join(ALTERNATES).encode('utf-8')
+
+  return b''.join((
+    HEADER.pack(MAGIC, len(codes), len(stems), len(alternates)),
+    codes.tobytes(),
+    stems,
+    alternates,
+  ))
+
+def loads(data):
+  '''
+  ## loads
+  adds the entries of a blob written by `dumps` to the lexicon.
+
+  ✎︎ tests
+  ```python
+  >>> data = dumps()
+  >>> count, alternates = len(IRREGULARS), len(ALTERNATES)
+  >>> clear_irregulars()
+  >>> loads(data)
+  >>> len(IRREGULARS) == count, get_irregular('burun').alternate
+  (True, 'burn')
+  >>> loads(data)
+  >>> len(IRREGULARS) == count, len(ALTERNATES) == alternates
+  (True, True)
+
+  ```
+  '''
+  magic, count, stems_size, alternates_size = HEADER.unpack_from(data)
+
+  if magic != MAGIC:
+    raise Exception('invalid irregular lexicon. run dumps again')
+
+  offset = HEADER.size
+  codes = array('I')
+  codes.frombytes(data[offset:offset + count * codes.itemsize])
+  offset += count * codes.itemsize
+
+  stems = data[offset:offset + stems_size].decode('utf-8')
+  offset += stems_size
+  alternates = data[offset:offset + alternates_size].decode('utf-8')
+
+  stems = stems.split(DELIMITER) if count else []
+  alternates = alternates.split(DELIMITER) if alternates_size else []
+
+  if not IRREGULARS.keys().isdisjoint(stems):
+    load_irregulars(
+      decode(stem, code, alternates)
+      for stem, code in zip(stems, codes)
+    )
+    return
+
+  shift = len(ALTERNATES) << ALTERNATE_SHIFT
+
+  if shift:
+    codes = [
+      code + shift if code >> ALTERNATE_SHIFT else code
+      for code in codes
+    ]
+
+  ALTERNATES.extend(alternates)
+  IRREGULARS.update(zip(stems, codes))
+  invalidate(stems)
+
+BUILTINS = (
+  ('saat', 'e', False),
+  ('kalp', 'e'),
+  ('hal', 'e'),
+  ('hayal', 'e'),
+  ('dikkat', 'e', False),
+  ('harf', 'e'),
+  ('gol', 'ö'),
+  ('rol', 'ö'),
+  ('alkol', 'ö'),
+  ('kontrol', 'ö'),
+  ('sembol', 'ö'),
+  ('top', None, False),
+  ('at', None, False),
+  ('ok', None, False),
+  ('ot', None, False),
+  ('et', None, False),
+  ('kat', None, False),
+  ('saç', None, False),
+  ('süt', None, False),
+  ('tank', None, False),
+  ('park', None, False),
+  *(
+    (stem, None, True, drop_vowel(stem))
+    for stem in (
+      'burun',
+      'ağız',
+      'oğul',
+      'alın',
+      'karın',
+      'akıl',
+      'isim',
+      'resim',
+      'şehir',
+      'fikir',
+      'beyin',
+      'boyun',
+      'gönül',
+    )
+  ),
+  *(
+    (stem, None, True, double(stem))
+    for stem in ('hak', 'his', 'af', 'zan', 'hat', 'sır', 'had')
+  ),
+  ('ret', None, True, 'redd'),
+  ('tıp', None, True, 'tıbb'),
+)
+
+for stem, *entry in BUILTINS:
+  IRREGULARS[stem] = encode(*entry)
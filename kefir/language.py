@@ -0,0 +1,383 @@
+'''
+# Languages
+
+The suffix tables of `kefir.suffix` are compiled for the sounds of
+turkish. A `Profile` declares the sounds of another language, or of
+another dialect, in the same terms:
+
+  - the front and back vowels, the rounded ones among them, and the
+    neutral ones, which do not decide between front and back (a word
+    with only neutral vowels counts as front, as in finnish and
+    hungarian)
+  - the voiced and voiceless consonants, and the final consonants
+    that soften before a vowel, with what they soften to
+  - the realizations of the vocalic archiphonemes, indexed by the
+    vowel class (back unrounded, front unrounded, back rounded, front
+    rounded), and of the consonantal ones, indexed by the final class
+    (vowel, voiced, voiceless, softening)
+
+`get_language` compiles a profile into lookup tables the first time
+it is asked for, and a `Language` compiles a suffix template for its
+sounds the first time it is used. `attach` and `inflect` pick the
+language per call and `inflect_many` per batch; either way the tables
+are chosen once, before any stem is looked at.
+
+The profiles other than turkish are phonology only: the turkic ones
+run the turkish case and copula templates through their own sounds,
+finnish and hungarian harmonize templates written for them.
+'''
+from collections import namedtuple
+from functools import lru_cache
+
+from .batch import (NOMINATIVE,
+                    CHUNK_SIZE,
+                    chunked,
+                    get_plan,
+                    get_request,
+                    get_features,
+                    inflect_safely)
+from .functional import join, identity
+from .phonology import (MissingVowelSound,
+                        get_key,
+                        get_vowel_class,
+                        PROFILE_CACHE_SIZE,
+                        VOWEL,
+                        FRONT,
+                        BACK,
+                        ROUNDED,
+                        VOICED,
+                        VOICELESS,
+                        FINAL_VOWEL,
+                        FINAL_VOICED,
+                        FINAL_VOICELESS,
+                        FINAL_SOFTENING)
+from .suffix import Template
+
+Profile = namedtuple('Profile', (
+  'name',
+  'front',
+  'back',
+  'rounded',
+  'neutral',
+  'voiced',
+  'voiceless',
+  'softening',
+  'vowel_harmony',
+  'consonant_harmony',
+))
+
+PROFILES = {
+  'turkish': Profile(
+    name='turkish',
+    front='eiöü',
+    back='aıou',
+    rounded='öüou',
+    neutral='',
+    voiced='bcdgğjlmnrvyz',
+    voiceless='çfhkpsşt',
+    softening={'p': 'b', 'ç': 'c', 't': 'd', 'k': 'ğ'},
+    vowel_harmony={'A': 'aeae', 'I': 'ıiuü'},
+    consonant_harmony={'D': 'ddtt', 'C': 'ccçç'},
+  ),
+  'azerbaijani': Profile(
+    name='azerbaijani',
+    front='eəiöü',
+    back='aıou',
+    rounded='öüou',
+    neutral='',
+    voiced='bcdgğjlmnrvyz',
+    voiceless='çfhkpqsştx',
+    softening={'k': 'y', 'q': 'ğ'},
+    vowel_harmony={'A': 'aəaə', 'I': 'ıiuü'},
+    consonant_harmony={'D': 'dddd', 'C': 'cccc'},
+  ),
+  'chuvash': Profile(
+    name='chuvash',
+    front='eĕiü',
+    back='aăıou',
+    rounded='',
+    neutral='',
+    voiced='jlmnrvyz',
+    voiceless='çfhkpsştx',
+    softening={},
+    vowel_harmony={'A': 'aeae', 'I': 'ăĕăĕ'},
+    consonant_harmony={'D': 'rttt', 'C': 'çççç'},
+  ),
+  'finnish': Profile(
+    name='finnish',
+    front='äöyei',
+    back='aou',
+    rounded='',
+    neutral='ei',
+    voiced='bdgjlmnrv',
+    voiceless='fhkpst',
+    softening={},
+    vowel_harmony={'A': 'aäaä', 'O': 'oöoö', 'U': 'uyuy'},
+    consonant_harmony={},
+  ),
+  'hungarian': Profile(
+    name='hungarian',
+    front='eéiíöőüű',
+    back='aáoóuú',
+    rounded='oóuúöőüű',
+    neutral='eéií',
+    voiced='bdgjlmnrvz',
+    voiceless='cfhkpst',
+    softening={},
+    vowel_harmony={'A': 'aeae', 'O': 'oeoö'},
+    consonant_harmony={},
+  ),
+}
+
+class Language:
+  '''
+  ## language
+  a profile compiled to lookup tables: the features and final class
+  of every sound, the class key of a stem (cached like
+  `kefir.phonology.analyze`) and the suffix templates compiled so
+  far.
+
+  ✎︎ tests
+  ```python
+  >>> finnish = get_language('finnish')
+  >>> inessive = Template('-ssA')
+  >>> [finnish.attach(word, inessive) for word in ('talo', 'kylä', 'tuoli', 'veli')]
+  ['talossa', 'kylässä', 'tuolissa', 'velissä']
+
+  >>> hungarian = get_language('hungarian')
+  >>> allative = Template('-hOz')
+  >>> [hungarian.attach(word, allative) for word in ('ház', 'kert', 'föld', 'füzet', 'papír')]
+  ['házhoz', 'kerthez', 'földhöz', 'füzethez', 'papírhoz']
+
+  >>> azerbaijani = get_language('azerbaijani')
+  >>> azerbaijani.inflect('kitab', 'locative'), azerbaijani.inflect('ev', 'ablative')
+  ('kitabda', 'evdən')
+  >>> azerbaijani.inflect('çörək', 'accusative'), azerbaijani.inflect('qonaq', 'dative')
+  ('çörəyi', 'qonağa')
+
+  >>> chuvash = get_language('chuvash')
+  >>> chuvash.inflect('hula', 'locative'), chuvash.inflect('kil', 'locative')
+  ('hulara', 'kilte')
+
+  >>> finnish.attach('talo', Template('-DA'))
+  Traceback (most recent call last):
+  ...
+  Exception: invalid archiphoneme D for finnish. options: A, O, U
+
+  ```
+  '''
+  __slots__ = ('profile', 'features', 'final_classes', 'templates', 'get_key')
+
+  def __init__(self, profile):
+    self.profile = profile
+    self.features = {}
+    self.final_classes = {}
+    self.templates = {}
+    self.get_key = lru_cache(maxsize=PROFILE_CACHE_SIZE)(self.classify)
+
+    for vowels, harmony_class in ((profile.front, FRONT), (profile.back, BACK)):
+      for vowel in vowels:
+        self.features[vowel] = VOWEL | harmony_class | (
+          ROUNDED if vowel in profile.rounded else 0
+        )
+
+    for consonants, features, final_class in (
+      (profile.voiced, VOICED, FINAL_VOICED),
+      (profile.voiceless, VOICELESS, FINAL_VOICELESS),
+    ):
+      for consonant in consonants:
+        self.features[consonant] = features
+        self.final_classes[consonant] = (
+          FINAL_SOFTENING if consonant in profile.softening else final_class
+        )
+
+  @property
+  def name(self):
+    return self.profile.name
+
+  def classify(self, text):
+    '''
+    the class key of a stem: front or back after the last vowel that
+    is not neutral, rounded or not after the last vowel.
+    '''
+    rounded = None
+
+    for symbol in reversed(text):
+      features = self.features.get(symbol, 0)
+
+      if not features & VOWEL:
+        continue
+
+      if rounded is None:
+        rounded = features & ROUNDED
+
+      if symbol not in self.profile.neutral:
+        front = features & FRONT
+        break
+    else:
+      if rounded is None:
+        raise MissingVowelSound
+
+      front = FRONT
+
+    return get_key(
+      get_vowel_class(front | rounded),
+      self.final_classes.get(text[-1], FINAL_VOWEL),
+    )
+
+  def realize(self, symbol, vowel_class, final_class):
+    vowels = self.profile.vowel_harmony.get(symbol)
+
+    if vowels:
+      return vowels[vowel_class]
+
+    consonants = self.profile.consonant_harmony.get(symbol)
+
+    if consonants:
+      return consonants[final_class]
+
+    if symbol.isupper():
+      raise Exception('invalid archiphoneme %s for %s. options: %s' % (
+        symbol,
+        self.name,
+        ', '.join((*self.profile.vowel_harmony, *self.profile.consonant_harmony)),
+      ))
+
+    return symbol
+
+  def is_vocalic(self, symbol):
+    return symbol in self.profile.vowel_harmony or bool(
+      self.features.get(symbol, 0) & VOWEL
+    )
+
+  def advance(self, vowel_class, final_class, sound):
+    features = self.features.get(sound, 0)
+
+    if not features & VOWEL:
+      return vowel_class, self.final_classes.get(sound, FINAL_VOWEL)
+
+    if sound in self.profile.neutral:
+      return vowel_class & 1, FINAL_VOWEL
+
+    return get_vowel_class(features), FINAL_VOWEL
+
+  def voice(self, text):
+    softened = self.profile.softening.get(text[-1:])
+
+    if softened:
+      return join(text[:-1], softened)
+
+    return text
+
+  def compile(self, template):
+    '''
+    the template compiled for the sounds of this language, part by
+    part as it was built.
+    '''
+    compiled = self.templates.get(template)
+
+    if compiled is None:
+      for source, softens, tags in template.parts:
+        part = Template(source, softens, tags=tags, language=self)
+        compiled = part if compiled is None else compiled.compose(
+          part,
+          self.voice,
+        )
+
+      self.templates[template] = compiled
+
+    return compiled
+
+  def attach(self, text, template):
+    softens, suffix, _ = self.compile(template).table[self.get_key(text)]
+    return join(self.voice(text) if softens else text, suffix)
+
+  def get_template(self, case, person, copula, is_plural):
+    plan = get_plan(case, person, copula, is_plural)
+
+    if plan.template is not None:
+      return self.compile(plan.template)
+
+    if plan.function is identity:
+      return self.compile(NOMINATIVE)
+
+    raise Exception('invalid request for %s. %r is not made of suffixes' % (
+      self.name,
+      plan,
+    ))
+
+  def inflect(
+    self,
+    stem,
+    case=None,
+    person=None,
+    copula=None,
+    is_plural=False,
+  ):
+    return self.attach(
+      stem,
+      self.get_template(case, person, copula, is_plural),
+    )
+
+  def inflect_many(self, requests, chunk_size=None, return_exceptions=False):
+    '''
+    `kefir.batch.inflect_many` with the tables of this language.
+    '''
+    if return_exceptions:
+      yield from inflect_safely(self.inflect_many, requests, chunk_size)
+      return
+
+    get_key, voice = self.get_key, self.voice
+    tables = {}
+
+    for chunk in chunked(requests, chunk_size or CHUNK_SIZE):
+      keys = {}
+
+      for stem, features in map(get_request, chunk):
+        try:
+          table = tables.get(features)
+        except TypeError:
+          features = get_features(features)
+          table = tables.get(features)
+
+        if table is None:
+          table = tables[features] = self.get_template(*features).table
+
+        key = keys.get(stem)
+
+        if key is None:
+          key = keys[stem] = get_key(stem)
+
+        softens, suffix, _ = table[key]
+        yield (voice(stem) if softens else stem) + suffix
+
+  def __repr__(self):
+    return 'Language(%r)' % self.name
+
+@lru_cache(maxsize=None)
+def get_language(name):
+  '''
+  ## get_language
+  the language of a profile, compiled on first use.
+
+  ✎︎ tests
+  ```python
+  >>> get_language('azerbaijani') is get_language('azerbaijani')
+  True
+  >>> list(get_language('azerbaijani').inflect_many([
+  ...   ('ev', 'locative'),
+  ...   ('ev', 'locative', 'first', 'perfective'),
+  ... ]))
+  ['evdə', 'evdəydim']
+
+  ```
+  '''
+  profile = PROFILES.get(name)
+
+  if profile is None:
+    raise Exception('invalid language %s. options: %s' % (
+      name,
+      ', '.join(PROFILES),
+    ))
+
+  return Language(profile)
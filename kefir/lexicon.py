@@ -0,0 +1,328 @@
+'''
+# Full-Form Lexicon
+
+Every paradigm cell of every stem in a list, written to one binary
+file that readers `mmap` instead of loading. Processes that open the
+same file share its pages, and opening it reads a fixed-size header
+and nothing else.
+
+The file holds four sections after the header:
+
+  - forms, sorted by their UTF-8 bytes and front-coded in blocks of
+    `BLOCK_SIZE`: every entry stores how many bytes it shares with
+    the one before it, the rest of its bytes, the stem number and
+    the paradigm cell. the first entry of a block shares nothing
+  - the byte offset of every block, so lookups bisect the blocks
+    by their first form and scan one block
+  - the byte offset of every stem
+  - the stems, UTF-8 encoded
+
+    python -m kefir lexicon stems.txt forms.lexicon
+
+Forms are sorted in runs of `RUN_SIZE` that are spilled to temporary
+files and merged, so writing does not hold every form in memory.
+'''
+import heapq
+import mmap
+import struct
+from array import array
+from collections import namedtuple
+from itertools import islice
+from tempfile import TemporaryFile
+
+from .paradigm import KEYS, Paradigm
+from .phonology import MissingVowelSound
+
+MAGIC = b'KEFIRLEX'
+HEADER = struct.Struct('<8sIIIIQQQQ')
+ENTRY = struct.Struct('<HH')
+TAIL = struct.Struct('<IB')
+
+BLOCK_SIZE = 16
+RUN_SIZE = 1 << 18
+MAX_REST = 0xFFFF
+
+Entry = namedtuple('Entry', ('stem', 'cell'))
+
+def get_prefix(previous, surface):
+  length = min(len(previous), len(surface), MAX_REST)
+
+  for index in range(length):
+    if previous[index] != surface[index]:
+      return index
+
+  return length
+
+def encode(previous, surface, stem, cell):
+  '''
+  ## encode
+  the entry of a form front-coded against the form before it. the
+  bytes it does not share with that form are at most `MAX_REST`.
+
+  ✎︎ tests
+  ```python
+  >>> encode(b'kitap', b'kitaba', 0, 3)
+  b'\\x04\\x00\\x02\\x00ba\\x00\\x00\\x00\\x00\\x03'
+  >>> encode(b'', bytes(70000), 0, 0)
+  Traceback (most recent call last):
+  ...
+  ValueError: form too long for the lexicon: 70000 bytes after the shared prefix, at most 65535
+
+  ```
+  '''
+  prefix = get_prefix(previous, surface)
+  rest = surface[prefix:]
+
+  if len(rest) > MAX_REST:
+    raise ValueError(
+      'form too long for the lexicon: %d bytes after the shared prefix, '
+      'at most %d' % (len(rest), MAX_REST)
+    )
+
+  return b''.join((
+    ENTRY.pack(prefix, len(rest)),
+    rest,
+    TAIL.pack(stem, cell),
+  ))
+
+def decode(buffer, offset, previous):
+  prefix, length = ENTRY.unpack_from(buffer, offset)
+  start = offset + ENTRY.size
+  end = start + length
+  stem, cell = TAIL.unpack_from(buffer, end)
+
+  return previous[:prefix] + buffer[start:end], stem, cell, end + TAIL.size
+
+def get_entries(stems):
+  for number, stem in enumerate(stems):
+    paradigm = Paradigm(stem)
+
+    for cell in range(len(KEYS)):
+      try:
+        surface = paradigm[cell]
+      except MissingVowelSound:
+        continue
+
+      yield surface.encode('utf-8'), number, cell
+
+def write_run(entries):
+  run = TemporaryFile()
+  previous = b''
+
+  for surface, stem, cell in entries:
+    run.write(encode(previous, surface, stem, cell))
+    previous = surface
+
+  run.flush()
+  return run
+
+def read_run(run):
+  size = run.seek(0, 2)
+
+  with mmap.mmap(run.fileno(), size, access=mmap.ACCESS_READ) as buffer:
+    offset = 0
+    surface = b''
+
+    while offset < size:
+      surface, stem, cell, offset = decode(buffer, offset, surface)
+      yield surface, stem, cell
+
+def sort_entries(entries, run_size=RUN_SIZE):
+  entries = iter(entries)
+  runs = []
+
+  while True:
+    run = sorted(islice(entries, run_size))
+
+    if not run:
+      break
+
+    runs.append(write_run(run))
+
+  try:
+    yield from heapq.merge(*map(read_run, runs))
+  finally:
+    for run in runs:
+      run.close()
+
+def pad(output):
+  output.write(bytes(-output.tell() % 8))
+
+def write_lexicon(stems, path, run_size=RUN_SIZE):
+  '''
+  ## write_lexicon
+  inflects every stem with `Paradigm` and writes the lexicon file,
+  returns the number of forms written.
+  '''
+  stems = list(dict.fromkeys(stems))
+  blocks = array('Q')
+  count = 0
+
+  with open(path, 'wb') as output:
+    output.write(bytes(HEADER.size))
+    pad(output)
+    previous = b''
+
+    for surface, stem, cell in sort_entries(get_entries(stems), run_size):
+      if count % BLOCK_SIZE == 0:
+        blocks.append(output.tell())
+        previous = b''
+
+      output.write(encode(previous, surface, stem, cell))
+      previous = surface
+      count += 1
+
+    pad(output)
+    blocks_offset = output.tell()
+    blocks.tofile(output)
+
+    encoded = [stem.encode('utf-8') for stem in stems]
+    offsets = array('Q', [0])
+
+    for stem in encoded:
+      offsets.append(offsets[-1] + len(stem))
+
+    stems_offset = output.tell()
+    offsets.tofile(output)
+    text_offset = output.tell()
+    output.write(b''.join(encoded))
+
+    output.seek(0)
+    output.write(HEADER.pack(
+      MAGIC,
+      len(KEYS),
+      BLOCK_SIZE,
+      len(blocks),
+      len(stems),
+      count,
+      blocks_offset,
+      stems_offset,
+      text_offset,
+    ))
+
+  return count
+
+class Lexicon:
+  '''
+  ## lexicon
+  a memory-mapped lexicon file. `lookup` returns every (stem, cell)
+  the surface form fills, where cell is a `Paradigm` key.
+
+  ✎︎ tests
+  ```python
+  >>> import os, tempfile
+  >>> directory = tempfile.TemporaryDirectory()
+  >>> path = os.path.join(directory.name, 'forms.lexicon')
+  >>> write_lexicon(['kitap', 'dal', 'tv'], path)
+  252
+
+  >>> with Lexicon.open(path) as lexicon:
+  ...   lexicon.lookup('daldık')
+  ...   'kitabım' in lexicon, 'kitapım' in lexicon, "tv'de" in lexicon, len(lexicon)
+  [Entry(stem='dal', cell=(<Copula.PERFECTIVE: 'perfective'>, <Person.FIRST: 'first'>, True))]
+  (True, False, True, 252)
+
+  >>> directory.cleanup()
+
+  ```
+  '''
+  __slots__ = ('file', 'buffer', 'blocks', 'offsets', 'text', 'count')
+
+  def __init__(self, file, buffer):
+    (
+      magic,
+      cells,
+      block_size,
+      blocks,
+      stems,
+      count,
+      blocks_offset,
+      stems_offset,
+      text_offset,
+    ) = HEADER.unpack_from(buffer)
+
+    if magic != MAGIC or cells != len(KEYS) or block_size != BLOCK_SIZE:
+      raise Exception('invalid lexicon file. rebuild it with this version')
+
+    view = memoryview(buffer)
+
+    self.file = file
+    self.buffer = buffer
+    self.count = count
+    self.blocks = view[blocks_offset:blocks_offset + blocks * 8].cast('Q')
+    self.offsets = view[stems_offset:stems_offset + (stems + 1) * 8].cast('Q')
+    self.text = view[text_offset:]
+
+  @staticmethod
+  def open(path):
+    file = open(path, 'rb')
+
+    try:
+      buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+      file.close()
+      raise
+
+    return Lexicon(file, buffer)
+
+  def close(self):
+    self.blocks.release()
+    self.offsets.release()
+    self.text.release()
+    self.buffer.close()
+    self.file.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+  def __len__(self):
+    return self.count
+
+  def __contains__(self, surface):
+    return bool(self.lookup(surface))
+
+  def get_stem(self, number):
+    start, end = self.offsets[number], self.offsets[number + 1]
+    return str(self.text[start:end], 'utf-8')
+
+  def get_head(self, block):
+    offset = self.blocks[block]
+    _, length = ENTRY.unpack_from(self.buffer, offset)
+    start = offset + ENTRY.size
+    return self.buffer[start:start + length]
+
+  def lookup(self, surface):
+    surface = surface.encode('utf-8')
+    low, high = 0, len(self.blocks)
+
+    while low < high:
+      middle = (low + high) // 2
+
+      if self.get_head(middle) < surface:
+        low = middle + 1
+      else:
+        high = middle
+
+    entries = []
+    block = max(low - 1, 0)
+    index = block * BLOCK_SIZE
+    offset = self.blocks[block] if self.blocks else 0
+    previous = b''
+
+    while index < self.count:
+      if index % BLOCK_SIZE == 0:
+        previous = b''
+
+      previous, stem, cell, offset = decode(self.buffer, offset, previous)
+      index += 1
+
+      if previous > surface:
+        break
+
+      if previous == surface:
+        entries.append(Entry(self.get_stem(stem), KEYS[cell]))
+
+    return entries
@@ -0,0 +1,233 @@
+'''
+# Normalization
+
+The phonology of kefir reads lowercase text composed to NFC: ANKARA
+has no vowel it knows, and a decomposed ü (u followed by a combining
+diaeresis) is not a vowel at all. `normalize` brings a token to that
+form and records what it takes to put it back:
+
+  - turkish casing: I lowers to ı and İ to i, and the other way
+    round when the casing is restored
+  - NFC composition, and an i left with a combining dot above by a
+    lowercasing that is not turkish is a plain i
+  - apostrophes: ’ ‘ ʼ and ` count as ', and the written stem of a
+    proper noun is kept as it is before the apostrophe, so Ahmet' in
+    the accusative is Ahmet'i and not Ahmed'i
+  - numerals and abbreviations are inflected as they are read, with
+    `kefir.pronunciation`
+
+A token is in lowercase, upper case, title case or mixed case, and
+its inflected form is given back in the same casing. suffixes of an
+upper case token are in upper case too.
+
+Every suffix template normalizes the text it is given, so the case
+and copula functions take any token. `subject`, `predicate` and the
+compiled plans normalize the stem once before the whole chain of
+suffixes. A suffix goes after the token as it is written, inflected
+or not: Ankara'da in the ablative is Ankara'dadan. Text that is
+already normal (lowercase letters only, a vowel among them) costs a
+template one flag of its cached profile and the entry points three
+string checks, and tokens are memoized, so a token that repeats is
+normalized once.
+
+✎︎ tests
+```python
+>>> from kefir import subject, predicate, inflect_many
+>>> from kefir.subject import GrammaticalCase
+>>> subject('ANKARA', case=GrammaticalCase.LOCATIVE)
+'ANKARADA'
+>>> subject('İzmir', case=GrammaticalCase.DATIVE), subject('Ben', case=GrammaticalCase.DATIVE)
+('İzmire', 'Bana')
+>>> subject('Ahmet’', case=GrammaticalCase.ACCUSATIVE), subject("IŞIK'", True)
+("Ahmet'i", "IŞIK'LAR")
+>>> predicate("Ankara'da", 'first', 'perfective')
+"Ankara'daydım"
+>>> list(inflect_many([('kütüphane', 'locative'), ('KİTAP', 'dative')]))
+['kütüphanede', 'KİTABA']
+>>> from kefir.subject import locative, ablative
+>>> locative('2024'), ablative("Ankara'da")
+("2024'te", "Ankara'dadan")
+
+```
+'''
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+from .pronunciation import VOWELS, pronounce
+
+APOSTROPHE = "'"
+
+LOWER = 0
+TITLE = 1
+UPPER = 2
+MIXED = 3
+
+LOWERCASE = str.maketrans({'I': 'ı', 'İ': 'i'})
+UPPERCASE = str.maketrans({'i': 'İ', 'ı': 'I'})
+APOSTROPHES = str.maketrans(dict.fromkeys('’‘ʼ`', APOSTROPHE))
+
+DOTTED_I = 'i\u0307'
+
+NORMALIZATION_CACHE_SIZE = 1 << 16
+
+def lower(text):
+  '''
+  ## lower
+  turkish lowercase.
+
+  ✎︎ tests
+  ```python
+  >>> lower('IŞIK'), lower('İSTANBUL')
+  ('ışık', 'istanbul')
+
+  ```
+  '''
+  return text.translate(LOWERCASE).lower()
+
+def upper(text):
+  '''
+  ## upper
+  turkish upper case.
+
+  ✎︎ tests
+  ```python
+  >>> upper('ışık'), upper('istanbul')
+  ('IŞIK', 'İSTANBUL')
+
+  ```
+  '''
+  return text.translate(UPPERCASE).upper()
+
+def get_casing(text):
+  capitals = [symbol.isupper() for symbol in text if symbol.isalpha()]
+
+  if not any(capitals):
+    return LOWER
+
+  if capitals[0] and not any(capitals[1:]):
+    return TITLE
+
+  if all(capitals):
+    return UPPER
+
+  return MIXED
+
+class Token(namedtuple('Token', (
+  'text',
+  'written',
+  'casing',
+  'apostrophe',
+  'prefix',
+))):
+  '''
+  ## token
+  a normalized token: the text kefir inflects, the text as written
+  (composed, without its apostrophe, one symbol for every symbol of
+  the text), its casing, where the suffixes start in the text (after
+  the apostrophe, `None` without one) and what is written before
+  them.
+  '''
+  __slots__ = ()
+
+  def recase(self, form):
+    if self.casing == LOWER:
+      return form
+
+    if self.casing == TITLE:
+      return upper(form[:1]) + form[1:]
+
+    if self.casing == UPPER:
+      return upper(form)
+
+    return ''.join(
+      upper(symbol) if written.isupper() else symbol
+      for symbol, written in zip(form, self.written)
+    ) + form[len(self.written):]
+
+  def restore(self, form):
+    '''
+    ### restore
+    an inflected form of the text in the casing of the token, with
+    the stem as written before the apostrophe of a proper noun.
+
+    ✎︎ tests
+    ```python
+    >>> normalize("KİTAP'").restore('kitabı')
+    "KİTAP'I"
+    >>> normalize('iPhone').restore('iphoneu')
+    'iPhoneu'
+    >>> normalize("Ankara'").restore('ankara'), normalize('10').restore('onda')
+    ('Ankara', "10'da")
+    >>> normalize('km').restore('kilometre değil')
+    'km değil'
+
+    ```
+    '''
+    index = self.apostrophe
+    form = self.recase(form)
+
+    if index is None or lower(form[:index - 1]) != self.text[:index - 1]:
+      return form
+
+    suffix = form[index:]
+
+    if not suffix[:1].isalpha():
+      return self.prefix + suffix
+
+    return self.prefix + APOSTROPHE + suffix
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize(text):
+  '''
+  ## normalize
+  the `Token` of a text.
+
+  ✎︎ tests
+  ```python
+  >>> normalize("Ankara’da")
+  Token(text='ankarada', written='Ankarada', casing=1, apostrophe=6, prefix='Ankara')
+  >>> normalize('TBMM')
+  Token(text='me', written='TBMM', casing=0, apostrophe=2, prefix='TBMM')
+  >>> normalize('kütüphane').text == 'kütüphane'
+  True
+
+  ```
+  '''
+  written = unicodedata.normalize('NFC', text).translate(APOSTROPHES)
+  written = written.replace(DOTTED_I, 'i')
+  index = written.rfind(APOSTROPHE)
+
+  if index > 0:
+    index -= written.count(APOSTROPHE, 0, index)
+  else:
+    index = None
+
+  written = written.replace(APOSTROPHE, '')
+  text = lower(written)
+  pronounced = pronounce(text)
+
+  if pronounced is not None:
+    return Token(pronounced, written, LOWER, len(pronounced), written)
+
+  return Token(
+    text,
+    written,
+    get_casing(written),
+    index,
+    None if index is None else written[:index],
+  )
+
+def get_token(text):
+  '''
+  ## get_token
+  the `Token` of a text that is not normal, `None` for a normal text
+  or anything but a string.
+  '''
+  if type(text) is not str or (
+    text.isalpha() and text.islower() and not VOWELS.isdisjoint(text)
+  ):
+    return None
+
+  token = normalize(text)
+  return None if token.text == text else token
@@ -0,0 +1,177 @@
+'''
+# Paradigm
+
+Every form of a stem: the six cases in singular and plural, the
+copulas for each person and number, and the possesive grid.
+
+A `Paradigm` is a read-only mapping from a cell key to its form.
+Cells are inflected on first access and memoized. The stem (and
+its plural) are analysed once and every cell reuses that analysis,
+so filling a cell is a single suffix table lookup. The case cells of
+a personal pronoun are looked up in `kefir.pronoun`, and a stem that
+is not normal is inflected through `kefir.normalization`.
+
+  - `(GrammaticalCase, is_plural)` for cases
+  - `(Copula, Person, is_plural)` for copulas
+  - `(Person, is_plural)` for possesives
+'''
+from collections.abc import Mapping
+
+from .functional import join
+from .normalization import get_token
+from .phonology import analyze, voice
+from .predication import Person, Copula, COPULAS, predicate
+from .pronoun import PRONOUNS, decline
+from .subject import GrammaticalCase, CASES, POSSESSIVE
+from .suffix import Suffix
+
+NUMBERS = (False, True)
+
+KEYS = (
+  *(
+    (case, is_plural)
+    for case in GrammaticalCase
+    for is_plural in NUMBERS
+  ),
+  *(
+    (copula, person, is_plural)
+    for copula in Copula
+    for is_plural in NUMBERS
+    for person in Person
+  ),
+  *(
+    (person, is_plural)
+    for is_plural in NUMBERS
+    for person in Person
+  ),
+)
+
+INDEX = {key: index for index, key in enumerate(KEYS)}
+
+def get_recipe(key):
+  category, *features = key
+
+  if isinstance(category, GrammaticalCase):
+    is_plural, = features
+    return is_plural, CASES.get(category), None
+
+  if isinstance(category, Copula):
+    person, is_plural = features
+
+    if category not in COPULAS:
+      return False, None, lambda stem: predicate(
+        stem,
+        person,
+        category,
+        is_plural,
+      )
+
+    return False, COPULAS[category][person, is_plural], None
+
+  return False, POSSESSIVE[key], None
+
+RECIPES = tuple(map(get_recipe, KEYS))
+
+class Paradigm(Mapping):
+  '''
+  ## paradigm
+  ✎︎ tests
+  ```python
+  >>> kitap = Paradigm('kitap')
+  >>> kitap[GrammaticalCase.DATIVE, True]
+  'kitaplara'
+  >>> kitap[Copula.PERFECTIVE, Person.FIRST, False]
+  'kitaptım'
+  >>> kitap[Person.FIRST, False]
+  'kitabım'
+  >>> kitap[0], len(kitap)
+  ('kitap', 84)
+
+  >>> kitap.table()[:4]
+  ('kitap', 'kitaplar', 'kitabın', 'kitapların')
+
+  >>> Paradigm('ben').table()[:6]
+  ('ben', 'biz', 'benim', 'bizim', 'bana', 'bize')
+
+  >>> ankara = Paradigm('ANKARA')
+  >>> ankara[GrammaticalCase.LOCATIVE, False], ankara[Person.FIRST, True]
+  ('ANKARADA', 'ANKARAMIZ')
+  >>> Paradigm("Ankara'")[GrammaticalCase.DATIVE, False], Paradigm('2024')[2]
+  ("Ankara'ya", "2024'ün")
+
+  ```
+  '''
+  __slots__ = ('stem', 'token', 'text', 'plural', 'cells', 'classes')
+
+  def __init__(self, stem):
+    self.stem = stem
+    self.token = get_token(stem)
+    self.text = stem if self.token is None else self.token.text
+    self.plural = None
+    self.cells = [None] * len(KEYS)
+    self.classes = {}
+
+  def __getitem__(self, key):
+    index = key if isinstance(key, int) else INDEX[key]
+    form = self.cells[index]
+
+    if form is None:
+      form = self.inflect(index)
+
+      if self.token is not None:
+        form = self.token.restore(form)
+
+      self.cells[index] = form
+
+    return form
+
+  def __iter__(self):
+    return iter(KEYS)
+
+  def __len__(self):
+    return len(KEYS)
+
+  def __repr__(self):
+    return 'Paradigm(%r)' % self.stem
+
+  def get_plural(self):
+    if self.plural is None:
+      self.plural = self.attach(self.text, Suffix.PLURAL)
+
+    return self.plural
+
+  def attach(self, base, template):
+    profile = self.classes.get(base)
+
+    if profile is None:
+      profile = self.classes[base] = analyze(base)
+
+    softens, suffix, _ = template.table[profile.key]
+
+    if profile.alternate is not None and template.alternates[profile.key]:
+      return join(profile.alternate, suffix)
+
+    return join(voice(base) if softens else base, suffix)
+
+  def inflect(self, index):
+    category, *features = KEYS[index]
+
+    if self.text in PRONOUNS and isinstance(category, GrammaticalCase):
+      return decline(self.text, *features, category)
+
+    is_plural, template, function = RECIPES[index]
+    base = self.get_plural() if is_plural else self.text
+
+    if function is not None:
+      return function(base)
+
+    if template is None:
+      return base
+
+    return self.attach(base, template)
+
+  def to_dict(self):
+    return dict(zip(KEYS, self.table()))
+
+  def table(self):
+    return tuple(map(self.__getitem__, range(len(KEYS))))
@@ -20,9 +20,12 @@ on the placement of the sound in the mouth.
  Rounded    ⟨u⟩ ⟨o⟩
 
 '''
+from collections import namedtuple
 from enum import Enum
+from functools import lru_cache
 
-from .functional import enum_values, join, reduce
+from .functional import join
+from .irregular import IRREGULARS, KEEPS_FINAL, get_irregular, register
 
 class MissingVowelSound(Exception):
   pass
@@ -79,9 +82,6 @@ VOICED_CONSONANTS = (CONTINUANT_VOICED
 CONSONANTS = (VOICED_CONSONANTS
               .union(VOICELESS_CONSONANTS))
 
-ends_with_consonant = lambda text: text[-1] in CONSONANTS;
-ends_with_voiceless = lambda text: text[-1] in VOICELESS_CONSONANTS;
-
 SOFTENING_SOUNDS = {
   'p': 'b',
   'ç': 'c',
@@ -96,54 +96,285 @@ HARDENING_SOUNDS = {
   'k': 'ğ',
 }
 
-def get_vowel_symbol(vowel):
-  for member in Front:
-    if member.value == vowel:
-      return member
+VOWEL = 1
+FRONT = 2
+BACK = 4
+ROUNDED = 8
+VOICED = 16
+VOICELESS = 32
+CONTINUANT = 64
 
-  for member in Back:
-    if member.value == vowel:
-      return member
+CONSONANT = VOICED | VOICELESS
 
-def get_last_vowel(text):
+def build_feature_table():
+  '''
+  ## feature table
+  every sound is described once as a bitmask of its
+  phonological features, so the predicates below look
+  a symbol up instead of scanning the vowel enums.
+
+  ✎︎ tests
+  ```python
+  >>> FEATURES['ü'] == VOWEL | FRONT | ROUNDED
+  True
+  >>> FEATURES['ş'] == VOICELESS
+  True
+  >>> FEATURES['r'] == VOICED | CONTINUANT
+  True
+
+  ```
+  '''
+  table = {}
+
+  for vowels, harmony_class in ((Front, FRONT), (Back, BACK)):
+    for vowel in vowels:
+      table[vowel.value] = VOWEL | harmony_class | (
+        ROUNDED if vowel in ROUNDED_VOWELS else 0
+      )
+
+  for consonants, features in (
+    (CONTINUANT_VOICED, VOICED | CONTINUANT),
+    (NON_CONTINUANT_VOICED, VOICED),
+    (VOICELESS_CONTINUANT, VOICELESS | CONTINUANT),
+    (VOICELESS_NON_CONTINUANT, VOICELESS),
+  ):
+    for consonant in consonants:
+      table[consonant] = features
+
+  return table
+
+FEATURES = build_feature_table()
+
+VOWEL_SYMBOLS = {
+  member.value: member
+  for vowels in (Front, Back)
+  for member in vowels
+}
+
+def build_harmony_table():
+  table = {}
+
+  for vowel in VOWEL_SYMBOLS.values():
+    features = FEATURES[vowel.value]
+    vowels = Front if features & FRONT else Back
+    table[vowel] = vowels.U if features & ROUNDED else vowels.I
+
+  return table
+
+HARMONY = build_harmony_table()
+
+FRONT_TO_BACK = {
+  front.value: back.value
+  for front, back in zip(Front, Back)
+}
+
+BACK_TO_FRONT = {
+  back: front
+  for front, back in FRONT_TO_BACK.items()
+}
+
+FINAL_VOWEL = 0
+FINAL_VOICED = 1
+FINAL_VOICELESS = 2
+FINAL_SOFTENING = 3
+
+def build_final_class_table():
+  table = {}
+
+  for symbol, features in FEATURES.items():
+    if symbol in SOFTENING_SOUNDS:
+      table[symbol] = FINAL_SOFTENING
+    elif features & VOICELESS:
+      table[symbol] = FINAL_VOICELESS
+    elif features & VOICED:
+      table[symbol] = FINAL_VOICED
+
+  return table
+
+FINAL_CLASSES = build_final_class_table()
+
+def get_vowel_class(features):
+  return (1 if features & FRONT else 0) | (2 if features & ROUNDED else 0)
+
+def get_key(vowel_class, final_class):
+  '''
+  ## phonological class key
+  suffixes only care about two things of the stem they
+  attach to: the class of the last vowel (back or front,
+  unrounded or rounded) and the class of the final sound
+  (vowel, voiced, voiceless or softening consonant). both
+  are packed into a small integer used to index the
+  allomorph tables of `kefir.suffix`.
+
+  ✎︎ tests
+  ```python
+  >>> analyze('kitap').key == get_key(0, FINAL_SOFTENING)
+  True
+  >>> analyze('üzüm').key == get_key(3, FINAL_VOICED)
+  True
+  >>> analyze('elma').key == get_key(0, FINAL_VOWEL)
+  True
+
+  ```
+  '''
+  return vowel_class << 2 | final_class
+
+KEYS = range(get_key(3, FINAL_SOFTENING) + 1)
+
+VOWEL_CLASSES = {
+  symbol: get_vowel_class(FEATURES[symbol]) << 2
+  for symbol in VOWEL_SYMBOLS
+}
+
+def get_regular_key(text):
+  '''
+  ## get_regular_key
+  the class key `analyze` gives a stem that is not irregular, without
+  the rest of its profile, `None` for a stem without a vowel. a
+  batch of stems that each take one suffix is mostly this scan.
+
+  ✎︎ tests
+  ```python
+  >>> [get_regular_key(stem) == analyze(stem).key for stem in ('kitap', 'üzüm', 'elma')]
+  [True, True, True]
+  >>> get_regular_key('tbmm') is None
+  True
+
+  ```
+  '''
   for symbol in reversed(text):
-    if symbol in enum_values(Front):
-      return symbol
+    vowel_class = VOWEL_CLASSES.get(symbol)
 
-    if symbol in enum_values(Back):
-      return symbol
+    if vowel_class is not None:
+      return vowel_class | FINAL_CLASSES.get(text[-1], FINAL_VOWEL)
 
-  raise MissingVowelSound
+def get_features(symbol):
+  return FEATURES.get(symbol, 0)
 
-def determine_vowel_harmony(text):
-  for sound in reversed(text):
-    if sound in enum_values(Front):
-      return Front
+def ends_with_consonant(text):
+  return bool(FEATURES.get(text[-1], 0) & CONSONANT)
 
-    if sound in enum_values(Back):
-      return Back
+def ends_with_voiceless(text):
+  return bool(FEATURES.get(text[-1], 0) & VOICELESS)
+
+def get_vowel_symbol(vowel):
+  return VOWEL_SYMBOLS.get(vowel)
+
+def get_last_vowel(text):
+  for symbol in reversed(text):
+    if FEATURES.get(symbol, 0) & VOWEL:
+      return symbol
 
   raise MissingVowelSound
 
+def determine_vowel_harmony(text):
+  return Front if FEATURES[get_last_vowel(text)] & FRONT else Back
+
 def is_front(text):
-  return determine_vowel_harmony(text) is Front
+  return bool(FEATURES[get_last_vowel(text)] & FRONT)
 
 def is_back(text):
-  return determine_vowel_harmony(text) is Back
+  return bool(FEATURES[get_last_vowel(text)] & BACK)
 
 def is_rounded(text):
-  return get_vowel_symbol(get_last_vowel(text)) in ROUNDED_VOWELS
+  return bool(FEATURES[get_last_vowel(text)] & ROUNDED)
 
 def harmony(sound):
-  for (vowels, affix) in (
-    (UNROUNDED_BACK_VOWELS, Back.I),
-    (UNROUNDED_FRONT_VOWELS, Front.I),
-    (ROUNDED_BACK_VOWELS, Back.U),
-    (ROUNDED_FRONT_VOWELS, Front.U),
-  ):
-    if sound in vowels:
-      break
-  return affix
+  return HARMONY[sound]
+
+PROFILE_CACHE_SIZE = 1 << 16
+
+class StemProfile(namedtuple('StemProfile', (
+  'last_vowel',
+  'harmony',
+  'is_rounded',
+  'final',
+  'can_soften',
+  'key',
+  'alternate',
+  'is_normal',
+), defaults=(None, True))):
+  '''
+  ## stem profile
+  everything the suffixing rules need to know about a stem,
+  worked out once: its last vowel, the harmony class of that
+  vowel (Front or Back), whether it is rounded, the feature
+  bits of the final sound, whether that sound softens, the
+  class key the suffix tables are indexed by, the shape an
+  irregular stem takes before a vowel (see `kefir.irregular`) and
+  whether it is written in lowercase letters only, as
+  `kefir.normalization` gives it.
+
+  ✎︎ tests
+  ```python
+  >>> profile = analyze('kitap')
+  >>> profile.last_vowel, profile.harmony, profile.is_rounded
+  (<Back.A: 'a'>, <enum 'Back'>, False)
+  >>> analyze('saat').harmony, analyze('top').can_soften
+  (<enum 'Front'>, False)
+  >>> analyze('burun').alternate
+  'burn'
+  >>> profile.ends_with_voiceless, profile.can_soften
+  (True, True)
+  >>> profile.high_vowel, profile.low_vowel
+  ('ı', 'a')
+  >>> analyze('üzüm').high_vowel
+  'ü'
+
+  ```
+  '''
+  __slots__ = ()
+
+  @property
+  def is_front(self):
+    return self.harmony is Front
+
+  @property
+  def is_back(self):
+    return self.harmony is Back
+
+  @property
+  def ends_with_consonant(self):
+    return bool(self.final & CONSONANT)
+
+  @property
+  def ends_with_voiceless(self):
+    return bool(self.final & VOICELESS)
+
+  @property
+  def high_vowel(self):
+    return HARMONY[self.last_vowel].value
+
+  @property
+  def low_vowel(self):
+    return (Front.E if self.harmony is Front else Back.A).value
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def analyze(text):
+  irregular = get_irregular(text)
+  last_vowel = VOWEL_SYMBOLS[
+    irregular and irregular.harmony or get_last_vowel(text)
+  ]
+  features = FEATURES[last_vowel.value]
+  final_class = FINAL_CLASSES.get(text[-1], FINAL_VOWEL)
+
+  if irregular and not irregular.softens and final_class == FINAL_SOFTENING:
+    final_class = FINAL_VOICELESS
+
+  return StemProfile(
+    last_vowel,
+    Front if features & FRONT else Back,
+    bool(features & ROUNDED),
+    FEATURES.get(text[-1], 0),
+    final_class == FINAL_SOFTENING,
+    get_key(get_vowel_class(features), final_class),
+    irregular and irregular.alternate,
+    text.isalpha() and text.islower(),
+  )
+
+@register
+def clear_profiles(stems):
+  analyze.cache_clear()
 
 def swap_front_and_back(text):
   '''
@@ -165,30 +396,8 @@ def swap_front_and_back(text):
 
   ```
   '''
-  symbols = []
-
-  if is_front(text):
-    vowel_set = [Front, Back]
-  else:
-    vowel_set = [Back, Front]
-
-  for symbol in text:
-    try:
-      determine_vowel_harmony(symbol)
-
-    except MissingVowelSound:
-      new = symbol
-
-    else:
-      for (vowel, to_replace) in zip(*vowel_set):
-        if vowel.value == symbol:
-          new = to_replace.value
-          break
-
-    finally:
-      symbols.append(new)
-
-  return join(*symbols)
+  swap = FRONT_TO_BACK if is_front(text) else BACK_TO_FRONT
+  return join(*(swap.get(symbol, symbol) for symbol in text))
 
 def voice(text):
   '''
@@ -221,9 +430,10 @@ def voice(text):
   proo⟨f⟩ → pro⟨v⟩e
   ```
   '''
-  for sound, softened in SOFTENING_SOUNDS.items():
-    if text.endswith(sound):
-      return join(text[:-1], softened)
+  softened = SOFTENING_SOUNDS.get(text[-1:])
+
+  if softened and not IRREGULARS.get(text, 0) & KEEPS_FINAL:
+    return join(text[:-1], softened)
 
   return text
 
@@ -258,8 +468,9 @@ def devoice(text):
   просьба → prozʲbə
   ```
   '''
-  for sound, softened in SOFTENING_SOUNDS.items():
-    if text.endswith(sound):
-      return join(text[:-1], softened)
+  softened = SOFTENING_SOUNDS.get(text[-1:])
+
+  if softened:
+    return join(text[:-1], softened)
 
   return text
@@ -7,30 +7,9 @@ features of turkish grammar.
 '''
 from enum import Enum
 
-from .functional import (join,
-                         is_truthy,
-                         skip_falsy_and_join,
-                         NOTHING,
-                         identity,
-                         get_enum_member)
-from .suffix import Suffix
-from .phonology import (get_last_vowel,
-                        get_vowel_symbol,
-                        Back,
-                        Front,
-                        is_front,
-                        is_back,
-                        is_rounded,
-                        voice,
-                        devoice,
-                        ends_with_consonant,
-                        ends_with_voiceless,
-                        UNROUNDED_BACK_VOWELS,
-                        ROUNDED_BACK_VOWELS,
-                        UNROUNDED_FRONT_VOWELS,
-                        ROUNDED_FRONT_VOWELS,
-                        harmony,
-                        swap_front_and_back)
+from .functional import join, get_enum_member
+from .suffix import Aspect, Suffix, Template, WordBuilder
+from .normalization import get_token
 
 class Person(Enum):
   FIRST = 'first'
@@ -50,6 +29,69 @@ class Copula(Enum):
   IMPOTENTIAL = 'impotential'
   CONDITIONAL = 'conditional'
 
+PRESENT = {
+  (Person.FIRST, False): Template('-(y)|Im', softens=True, tags=('COP', '1SG')),
+  (Person.SECOND, False): Template('-sIn', tags=('2SG',)),
+  (Person.THIRD, False): Template(''),
+  (Person.FIRST, True): Template('-(y)|Iz', softens=True, tags=('COP', '1PL')),
+  (Person.SECOND, True): Template('-sInIz', tags=('2PL',)),
+  (Person.THIRD, True): Template('-lAr', tags=('3PL',)),
+}
+
+PAST = {
+  (Person.FIRST, False): Template('-(y)|DI|m', tags=('COP', 'PAST', '1SG')),
+  (Person.SECOND, False): Template('-(y)|DI|n', tags=('COP', 'PAST', '2SG')),
+  (Person.THIRD, False): Template('-(y)|DI', tags=('COP', 'PAST')),
+  (Person.FIRST, True): Template('-(y)|DI|k', tags=('COP', 'PAST', '1PL')),
+  (Person.SECOND, True): Template('-(y)|DI|nIz', tags=('COP', 'PAST', '2PL')),
+  (Person.THIRD, True): Template('-(y)|DI|lAr', tags=('COP', 'PAST', '3PL')),
+}
+
+def conjugate(copula, endings):
+  return {
+    person: copula + ending
+    for person, ending in endings.items()
+  }
+
+INFERENTIAL = conjugate(Suffix.INFERENTIAL, PRESENT)
+IMPERFECTIVE = conjugate(Aspect.IMPERFECTIVE, PRESENT)
+FUTURE = conjugate(Aspect.FUTURE, PRESENT)
+PROGRESSIVE = conjugate(Aspect.PROGRESSIVE, PRESENT)
+NECESSITATIVE = conjugate(Aspect.NECESSITATIVE, PRESENT)
+
+CONDITIONAL = {
+  **conjugate(Suffix.CONDITIONAL, {
+    (Person.FIRST, False): Template('-m', tags=('1SG',)),
+    (Person.SECOND, False): Template('-n', tags=('2SG',)),
+    (Person.THIRD, False): Template(''),
+    (Person.FIRST, True): Template('-k', tags=('1PL',)),
+    (Person.SECOND, True): Template('-nIz', tags=('2PL',)),
+  }),
+  (Person.THIRD, True): Suffix.PLURAL + Suffix.CONDITIONAL,
+}
+
+IMPOTENTIAL = conjugate(Aspect.IMPOTENTIAL, {
+  (Person.FIRST, False): Template('-m', tags=('1SG',)),
+  (Person.SECOND, False): Template('-z|sIn', tags=('AOR', '2SG')),
+  (Person.THIRD, False): Template('-z', tags=('AOR',)),
+  (Person.FIRST, True): Template('-yIz', tags=('1PL',)),
+  (Person.SECOND, True): Template('-z|sInIz', tags=('AOR', '2PL')),
+  (Person.THIRD, True): Template('-z|lAr', tags=('AOR', '3PL')),
+})
+
+COPULAS = {
+  Copula.ZERO: dict.fromkeys(PRESENT, Template('')),
+  Copula.TOBE: dict.fromkeys(PRESENT, Suffix.TOBE),
+  Copula.PERSONAL: PRESENT,
+  Copula.PERFECTIVE: PAST,
+  Copula.IMPERFECTIVE: IMPERFECTIVE,
+  Copula.PROGRESSIVE: PROGRESSIVE,
+  Copula.NECESSITATIVE: NECESSITATIVE,
+  Copula.FUTURE: FUTURE,
+  Copula.IMPOTENTIAL: IMPOTENTIAL,
+  Copula.CONDITIONAL: CONDITIONAL,
+}
+
 def get_copula_processor(copula):
   return {
     Copula.NEGATIVE: negative,
@@ -119,6 +161,9 @@ def negative(
 
   ```
   '''
+  if isinstance(predicate, WordBuilder):
+    return predicate.append(join(delimiter, Suffix.NEGATIVE), 'NEG')
+
   return join(predicate, delimiter, Suffix.NEGATIVE)
 
 def tobe(
@@ -148,24 +193,7 @@ def tobe(
 
   ```
   '''
-  last_vowel = get_last_vowel(predicate)
-  sound = get_vowel_symbol(last_vowel)
-
-  for (vowels, affix) in (
-    (UNROUNDED_BACK_VOWELS, Back.I),
-    (UNROUNDED_FRONT_VOWELS, Front.I),
-    (ROUNDED_BACK_VOWELS, Back.U),
-    (ROUNDED_FRONT_VOWELS, Front.U),
-  ):
-    if sound in vowels:
-      break
-
-  return skip_falsy_and_join(
-    predicate,
-    Suffix.D,
-    affix.value,
-    Suffix.R,
-  )
+  return Suffix.TOBE(predicate)
 
 def personal(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -191,7 +219,7 @@ def personal(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  return impersonate(predicate, whom, is_plural, in_past=False)
+  return PRESENT[whom, is_plural](predicate)
 
 def inferential(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -226,26 +254,7 @@ def inferential(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  last_vowel = get_last_vowel(predicate)
-  sound = get_vowel_symbol(last_vowel)
-
-  inference_suffix = join(
-    'm',
-    harmony(
-      get_vowel_symbol(
-        get_last_vowel(
-          predicate))).value,
-    'ş'
-  )
-
-  return skip_falsy_and_join(
-    predicate,
-
-    # combinative consontant ⟨y⟩
-    not ends_with_consonant(predicate) and Suffix.Y,
-
-    impersonate(inference_suffix, whom, is_plural),
-  )
+  return INFERENTIAL[whom, is_plural](predicate)
 
 def conditional(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -271,37 +280,7 @@ def conditional(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  last_vowel = get_last_vowel(predicate)
-  sound = get_vowel_symbol(last_vowel)
-
-  condition_suffix = Suffix.SE if is_front(predicate) else Suffix.SA
-
-  for (to_whom, plurality, personification) in (
-    (Person.FIRST, False, Suffix.M),
-    (Person.SECOND, False, Suffix.N),
-    (Person.THIRD, False, NOTHING),
-    (Person.FIRST, True, Suffix.K),
-    (Person.SECOND, True, Suffix.NIZ),
-    (Person.THIRD, True, NOTHING),
-  ):
-    if to_whom == whom and plurality == is_plural:
-      break
-
-  return skip_falsy_and_join(
-    predicate,
-
-    # plural suffix for 3rd person
-    whom == Person.THIRD
-    and is_plural
-    and (Suffix.LER if is_front(predicate) else Suffix.LAR),
-
-    # combinative consontant ⟨y⟩
-    not ends_with_consonant(predicate)
-    and Suffix.Y,
-
-    condition_suffix,
-    personification,
-  )
+  return CONDITIONAL[whom, is_plural](predicate)
 
 def perfective(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -345,7 +324,7 @@ def perfective(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  return impersonate(predicate, whom, is_plural, in_past=True)
+  return PAST[whom, is_plural](predicate)
 
 def imperfective(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -389,18 +368,7 @@ def imperfective(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  imperfect_copula = skip_falsy_and_join(
-    ends_with_consonant(predicate) and harmony(
-      get_vowel_symbol(
-        get_last_vowel(
-          predicate))).value,
-    Suffix.IMPERFECT,
-  )
-
-  return join(
-    predicate,
-    impersonate(imperfect_copula, whom, is_plural, in_past=False)
-  )
+  return IMPERFECTIVE[whom, is_plural](predicate)
 
 def future(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -428,12 +396,7 @@ def future(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  future_copula = join(
-    predicate,
-    Suffix.FUTURE if is_front(predicate) else swap_front_and_back(Suffix.FUTURE),
-  )
-
-  return impersonate(future_copula, whom, is_plural, in_past=False)
+  return FUTURE[whom, is_plural](predicate)
 
 def progressive(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -456,14 +419,7 @@ def progressive(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  progressive_copula = join(
-    predicate,
-    Suffix.PROGRESSIVE
-      if is_front(predicate)
-      else swap_front_and_back(Suffix.PROGRESSIVE),
-  )
-
-  return impersonate(progressive_copula, whom, is_plural, in_past=False)
+  return PROGRESSIVE[whom, is_plural](predicate)
 
 def necessitative(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -488,14 +444,7 @@ def necessitative(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  progressive_copula = join(
-    predicate,
-    Suffix.NECESSITY
-      if is_front(predicate)
-      else swap_front_and_back(Suffix.NECESSITY),
-  )
-
-  return impersonate(progressive_copula, whom, is_plural, in_past=False)
+  return NECESSITATIVE[whom, is_plural](predicate)
 
 def impotential(predicate, whom=Person.THIRD, is_plural=False):
   '''
@@ -535,150 +484,10 @@ def impotential(predicate, whom=Person.THIRD, is_plural=False):
 
   ```
   '''
-  last_vowel = get_last_vowel(predicate)
-  sound = get_vowel_symbol(last_vowel)
-
-  if is_back(predicate):
-    impotential_copula = swap_front_and_back(Suffix.IMPOTENTIAL)
-    plurality = Suffix.LAR
-  else:
-    impotential_copula = Suffix.IMPOTENTIAL
-    plurality = Suffix.LER
-
-  for (to_whom, plurality, personification) in (
-    (Person.FIRST, False, Suffix.M),
-    (Person.SECOND, False, Suffix.Z + Suffix.SIN),
-    (Person.THIRD, False, Suffix.Z),
-    (Person.FIRST, True, Suffix.Y + Suffix.IZ),
-    (Person.SECOND, True, Suffix.Z + Suffix.SIN + Suffix.IZ),
-    (Person.THIRD, True, Suffix.Z + plurality),
-  ):
-    if to_whom == whom and plurality == is_plural:
-      break
-
-  return skip_falsy_and_join(
-    voice(predicate),
-
-    # combinative consontant ⟨y⟩
-    not ends_with_consonant(predicate)
-    and Suffix.Y,
-
-    impotential_copula,
-    personification,
-  )
-
-def first_person_singular(text, in_past=False):
-  return skip_falsy_and_join(
-    # last vowel should not be voiced in alethic modality
-    text if in_past else voice(text),
-
-    # combinative consontant ⟨y⟩
-    not ends_with_consonant(text) and Suffix.Y,
-
-    # ⟨d⟩ or ⟨t⟩
-    in_past and (Suffix.T if ends_with_voiceless(text) else Suffix.D),
-
-    # ⟨a⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩
-    harmony(
-      get_vowel_symbol(
-        get_last_vowel(
-          text))).value,
-    Suffix.M,
-  )
-
-def second_person_singular(text, in_past=False):
-  return skip_falsy_and_join(
-    text,
-
-    # combinative consontant ⟨y⟩
-    in_past and not ends_with_consonant(text) and Suffix.Y,
-
-    # ⟨d⟩ or ⟨t⟩
-    in_past and (Suffix.T if ends_with_voiceless(text) else Suffix.D),
-
-    # sound ⟨s⟩ in present time
-    not in_past and Suffix.S,
-
-    harmony( # ⟨a⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩
-      get_vowel_symbol(
-        get_last_vowel(
-          text))).value,
-
-    Suffix.N,
-  )
-
-
-def third_person_singular(text, in_past=False):
-  return skip_falsy_and_join(
-    text,
-
-    # combinative consontant ⟨y⟩
-    not ends_with_consonant(text) and Suffix.Y,
-
-    # add ⟨t⟩ or ⟨d⟩ for alethic modality
-    in_past and (Suffix.T if ends_with_voiceless(text) else Suffix.D),
-
-    in_past and harmony( # ⟨a⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩
-      get_vowel_symbol(
-        get_last_vowel(
-          text)
-        )
-      ).value,
-  )
-
-def first_person_plural(text, in_past=False):
-  return skip_falsy_and_join(
-    # last vowel should not be voiced in alethic modality
-    text if in_past else voice(text),
-
-    # combinative consontant ⟨y⟩
-    not ends_with_consonant(text) and Suffix.Y,
-
-    # ⟨d⟩ or ⟨t⟩
-    in_past and (Suffix.T if ends_with_voiceless(text) else Suffix.D),
-
-    # ⟨a⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩
-    harmony(
-      get_vowel_symbol(
-        get_last_vowel(
-          text))).value,
-
-    Suffix.K if in_past else Suffix.Z
-  )
-
-def second_person_plural(text, in_past=False):
-  return skip_falsy_and_join (
-    second_person_singular(text, in_past),
-
-    # ⟨a⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩
-    harmony(
-      get_vowel_symbol(
-        get_last_vowel(
-          text))).value,
-
-    Suffix.Z,
-  )
-
-def third_person_plural(text, in_past=False):
-  return skip_falsy_and_join(
-    third_person_singular(text, in_past),
-
-    # -lar or -ler, plural affix
-    Suffix.LER if is_front(text) else Suffix.LAR
-  )
+  return IMPOTENTIAL[whom, is_plural](predicate)
 
 def impersonate(text, to_whom, is_plural, in_past=False):
-  for (person, plurality, processor) in (
-    (Person.FIRST, False, first_person_singular),
-    (Person.SECOND, False, second_person_singular),
-    (Person.THIRD, False, third_person_singular),
-    (Person.FIRST, True, first_person_plural),
-    (Person.SECOND, True, second_person_plural),
-    (Person.THIRD, True, third_person_plural),
-  ):
-    if person == to_whom \
-      and is_plural == plurality:
-      return processor(text, in_past)
+  return (PAST if in_past else PRESENT)[to_whom, is_plural](text)
 
 def combinator(copula, text, whom=Person.THIRD, is_plural=False):
   try:
@@ -697,6 +506,11 @@ def predicate(
   copula=Copula.ZERO,
   is_plural=False,
 ):
+  token = get_token(text)
+
+  if token is not None:
+    return token.restore(predicate(token.text, person, copula, is_plural))
+
   if isinstance(person, str):
     person = get_enum_member(Person, person)
   if isinstance(copula, str):
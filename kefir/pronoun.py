@@ -10,6 +10,128 @@
   ablative    benden  senden  ondan   bizden  sizden  onlardan
   genitive    benim   senin   onun    bizim   sizin   onların
 
-TODO: Implement pronouns.
+Personal pronouns do not follow the case rules of nouns (ben takes
+the dative as bana, o takes an extra n as onun), so they are not
+inflected at all: every form is looked up in one frozen table.
+
+A form is addressed by a small integer code, packing the case, the
+number and the person, so whole arrays of codes can be looked up at
+once with `lookup`.
 '''
+from array import array
+
+from .functional import get_enum_member
+from .predication import Person
+
+PERSONS = (Person.FIRST, Person.SECOND, Person.THIRD)
+
+CASES = (
+  'nominative',
+  'genitive',
+  'dative',
+  'accusative',
+  'ablative',
+  'locative',
+)
+
+TABLE = (
+  ('ben', 'sen', 'o', 'biz', 'siz', 'onlar'),
+  ('benim', 'senin', 'onun', 'bizim', 'sizin', 'onların'),
+  ('bana', 'sana', 'ona', 'bize', 'size', 'onlara'),
+  ('beni', 'seni', 'onu', 'bizi', 'sizi', 'onları'),
+  ('benden', 'senden', 'ondan', 'bizden', 'sizden', 'onlardan'),
+  ('bende', 'sende', 'onda', 'bizde', 'sizde', 'onlarda'),
+)
+
+WIDTH = len(TABLE[0])
+
+FORMS = tuple(form for row in TABLE for form in row)
+
+PRONOUNS = {form: column for column, form in enumerate(TABLE[0])}
+
+def get_case_index(case):
+  if isinstance(case, str):
+    if case.lower() not in CASES:
+      raise Exception('invalid case %s. options: %s' % (case, CASES))
+
+    return CASES.index(case.lower())
+
+  return (case if isinstance(case, int) else case.value) - 1
+
+def get_code(person, is_plural=False, case='nominative'):
+  '''
+  ## get_code
+  the code of a pronoun form: its case, in the order of
+  `GrammaticalCase`, then its number, then its person.
+
+  ✎︎ tests
+  ```python
+  >>> get_code(Person.FIRST), get_code('third', True, 'genitive')
+  (0, 11)
+  >>> FORMS[get_code('first', False, 'dative')]
+  'bana'
+
+  ```
+  '''
+  if isinstance(person, str):
+    person = get_enum_member(Person, person)
+
+  if person not in PERSONS:
+    raise Exception('invalid person. options: %s' % Person)
+
+  return (
+    get_case_index(case) * WIDTH
+    + (WIDTH // 2 if is_plural else 0)
+    + PERSONS.index(person)
+  )
+
+def get_codes(requests):
+  '''
+  ## get_codes
+  packs (person, is_plural, case) requests into an array of codes.
+  '''
+  return array('B', (get_code(*request) for request in requests))
+
+def lookup(codes):
+  '''
+  ## lookup
+  the forms of a sequence of codes: a list, an `array` or a numpy
+  array of integers.
+
+  ✎︎ tests
+  ```python
+  >>> lookup(get_codes([
+  ...   ('first', False, 'dative'),
+  ...   ('third', False, 'genitive'),
+  ...   ('third', True, 'locative'),
+  ... ]))
+  ['bana', 'onun', 'onlarda']
+
+  ```
+  '''
+  return list(map(FORMS.__getitem__, codes))
+
+def decline(pronoun, is_plural=False, case='nominative'):
+  '''
+  ## decline
+  a personal pronoun in a case, `None` if it is not a pronoun.
+  the plural of a singular pronoun is its plural pronoun.
+
+  ✎︎ tests
+  ```python
+  >>> decline('ben', case='dative'), decline('o', True, 'genitive')
+  ('bana', 'onların')
+  >>> decline('kitap') is None
+  True
+
+  ```
+  '''
+  column = PRONOUNS.get(pronoun)
+
+  if column is None:
+    return None
+
+  if is_plural and column < WIDTH // 2:
+    column += WIDTH // 2
 
+  return FORMS[get_case_index(case) * WIDTH + column]
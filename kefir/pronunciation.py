@@ -0,0 +1,180 @@
+'''
+# Pronunciation
+
+Numerals and abbreviations are written without vowels, but they are
+inflected as they are read, and their suffixes follow an apostrophe:
+
+  - 5'e (beşe), 10'da (onda), 2024'te (iki bin yirmi dörtte),
+    1000'den (binden)
+  - TBMM'ye (te be me me), THY'den (te he ye)
+  - km'ye (kilometre), kg'dan (kilogram)
+
+Only the end of what is read decides the suffix, so a numeral is not
+spelled out: its last digit that is not zero, and how many zeros
+follow it, pick one word out of a few small tables. An abbreviation
+is read by its last letter, unless it is a unit.
+
+`pronounce` gives that word, and `kefir.normalization` inflects it in
+place of the token, so `subject`, `predicate` and `inflect_many` take
+numerals and abbreviations as they take words.
+
+✎︎ tests
+```python
+>>> from kefir import inflect_many
+>>> list(inflect_many([
+...   ('5', 'dative'),
+...   ('10', 'locative'),
+...   ('2024', 'locative'),
+...   ('1.000.000', 'ablative'),
+...   ('TBMM', 'dative'),
+...   ('km', 'dative'),
+...   ('3,5', 'locative', 'first', 'perfective'),
+...   '2024',
+... ]))
+["5'e", "10'da", "2024'te", "1.000.000'dan", "TBMM'ye", "km'ye", "3,5'teydim", '2024']
+
+```
+'''
+VOWELS = frozenset('aeıioöuü')
+
+DIGITS = '0123456789'
+
+UNITS = (
+  'sıfır',
+  'bir',
+  'iki',
+  'üç',
+  'dört',
+  'beş',
+  'altı',
+  'yedi',
+  'sekiz',
+  'dokuz',
+)
+
+TENS = (
+  None,
+  'on',
+  'yirmi',
+  'otuz',
+  'kırk',
+  'elli',
+  'altmış',
+  'yetmiş',
+  'seksen',
+  'doksan',
+)
+
+HUNDRED = 'yüz'
+
+POWERS = (
+  'bin',
+  'milyon',
+  'milyar',
+  'trilyon',
+  'katrilyon',
+  'kentilyon',
+)
+
+SEPARATOR = '.'
+DECIMAL_SEPARATOR = ','
+
+LETTERS = {
+  'b': 'be',
+  'c': 'ce',
+  'ç': 'çe',
+  'd': 'de',
+  'f': 'fe',
+  'g': 'ge',
+  'ğ': 'ge',
+  'h': 'he',
+  'j': 'je',
+  'k': 'ke',
+  'l': 'le',
+  'm': 'me',
+  'n': 'ne',
+  'p': 'pe',
+  'q': 'kü',
+  'r': 're',
+  's': 'se',
+  'ş': 'şe',
+  't': 'te',
+  'v': 've',
+  'w': 've',
+  'x': 'iks',
+  'y': 'ye',
+  'z': 'ze',
+}
+
+ABBREVIATIONS = {
+  'km': 'kilometre',
+  'cm': 'santimetre',
+  'mm': 'milimetre',
+  'kg': 'kilogram',
+  'mg': 'miligram',
+  'lt': 'litre',
+  'ml': 'mililitre',
+  'sn': 'saniye',
+  'dk': 'dakika',
+}
+
+def get_digits(text):
+  index = len(text)
+
+  while index and (text[index - 1] in DIGITS or text[index - 1] == SEPARATOR):
+    index -= 1
+
+  return text[index:].replace(SEPARATOR, '')
+
+def get_numeral(digits):
+  '''
+  ## get_numeral
+  the last word of a numeral as it is read.
+
+  ✎︎ tests
+  ```python
+  >>> [get_numeral(digits) for digits in ('7', '40', '300', '2000', '30000000', '0')]
+  ['yedi', 'kırk', 'yüz', 'bin', 'milyon', 'sıfır']
+
+  ```
+  '''
+  significant = digits.rstrip('0')
+
+  if not significant:
+    return UNITS[0]
+
+  zeros = len(digits) - len(significant)
+
+  if not zeros:
+    return UNITS[DIGITS.index(significant[-1])]
+
+  if zeros == 1:
+    return TENS[DIGITS.index(significant[-1])]
+
+  if zeros == 2:
+    return HUNDRED
+
+  return POWERS[min(zeros // 3, len(POWERS)) - 1]
+
+def pronounce(text):
+  '''
+  ## pronounce
+  the word a lowercase token ends with when it is read, `None` for a
+  token that is read as it is written.
+
+  ✎︎ tests
+  ```python
+  >>> pronounce('2024'), pronounce('3,5'), pronounce('tbmm'), pronounce('km')
+  ('dört', 'beş', 'me', 'kilometre')
+  >>> pronounce('kitap') is None
+  True
+
+  ```
+  '''
+  if text and text[-1] in DIGITS:
+    return get_numeral(get_digits(text.rpartition(DECIMAL_SEPARATOR)[2]))
+
+  if not VOWELS.isdisjoint(text):
+    return None
+
+  return ABBREVIATIONS.get(text) or LETTERS.get(text[-1:])
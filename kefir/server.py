@@ -0,0 +1,220 @@
+'''
+# Inflection Server
+
+A local asyncio server for services that would otherwise pay for
+kefir's cold caches in every process.
+
+    python -m kefir serve --port 8470
+    python -m kefir serve --unix /tmp/kefir.sock
+
+The protocol is line-delimited JSON. A request is an object with the
+keys of an `Inflection` (`plural` is accepted for `is_plural`) or an
+array in the same order, optionally with an `id` that is echoed back.
+Every request is answered, in order, with `{"form": ...}` or
+`{"error": ...}`.
+
+Requests from every connection are gathered into micro-batches: the
+first request of a batch waits at most `window` seconds for others to
+join it, up to `batch_size` requests, and the batch is inflected with
+one `inflect_many` call against the caches of this process.
+
+Backpressure: the batch queue holds at most `queue_size` requests and
+a connection at most `pending` unanswered ones. When either is full
+the server stops reading from the connection, so a client that sends
+faster than it reads is slowed down by its own socket buffers.
+'''
+import asyncio
+import json
+
+from .batch import inflect_many, warm
+
+WINDOW = 0.002
+BATCH_SIZE = 1024
+QUEUE_SIZE = 8192
+PENDING = 256
+
+def get_request(message):
+  if isinstance(message, list):
+    return None, tuple(message)
+
+  return message.get('id'), (
+    message['stem'],
+    message.get('case'),
+    message.get('person'),
+    message.get('copula'),
+    message.get('is_plural', message.get('plural')),
+  )
+
+def get_response(identifier, key, value):
+  response = {key: value}
+
+  if identifier is not None:
+    response['id'] = identifier
+
+  return json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+
+def inflect_batch(requests):
+  try:
+    return [('form', form) for form in inflect_many(requests, len(requests))]
+  except Exception:
+    pass
+
+  results = []
+
+  for request in requests:
+    try:
+      results.append(('form', next(inflect_many((request,)))))
+    except Exception as error:
+      results.append(('error', str(error)))
+
+  return results
+
+class Server:
+  '''
+  ## server
+  ✎︎ tests
+  ```python
+  >>> async def ask(*lines):
+  ...   server = Server()
+  ...   listener = await server.start(port=0)
+  ...   port = listener.sockets[0].getsockname()[1]
+  ...   reader, writer = await asyncio.open_connection('127.0.0.1', port)
+  ...   writer.write(b''.join(line.encode() + b'\\n' for line in lines))
+  ...   responses = [await reader.readline() for line in lines]
+  ...   writer.close()
+  ...   listener.close()
+  ...   await server.stop()
+  ...   return [response.decode().strip() for response in responses]
+
+  >>> for response in asyncio.run(ask(
+  ...   '{"id": 1, "stem": "dal", "case": "locative", "copula": "perfective"}',
+  ...   '["kitap", "dative"]',
+  ...   '{"stem": "kitap", "case": "nowhere"}',
+  ...   'not json',
+  ... )):
+  ...   print(response)
+  {"form": "daldaydı", "id": 1}
+  {"form": "kitaba"}
+  {"error": "invalid case. options: <enum 'GrammaticalCase'>"}
+  {"error": "invalid request: Expecting value: line 1 column 1 (char 0)"}
+
+  ```
+  '''
+  def __init__(
+    self,
+    window=WINDOW,
+    batch_size=BATCH_SIZE,
+    queue_size=QUEUE_SIZE,
+    pending=PENDING,
+  ):
+    self.window = window
+    self.batch_size = batch_size
+    self.queue_size = queue_size
+    self.pending = pending
+    self.queue = None
+    self.batcher = None
+
+  async def start(self, host='127.0.0.1', port=8470, unix=None):
+    warm()
+    self.queue = asyncio.Queue(self.queue_size)
+    self.batcher = asyncio.create_task(self.run_batches())
+
+    if unix is not None:
+      return await asyncio.start_unix_server(self.serve, unix)
+
+    return await asyncio.start_server(self.serve, host, port)
+
+  async def stop(self):
+    self.batcher.cancel()
+
+    try:
+      await self.batcher
+    except asyncio.CancelledError:
+      pass
+
+  async def run_batches(self):
+    loop = asyncio.get_running_loop()
+
+    while True:
+      batch = [await self.queue.get()]
+      deadline = loop.time() + self.window
+
+      while len(batch) < self.batch_size:
+        timeout = deadline - loop.time()
+
+        if timeout <= 0:
+          break
+
+        try:
+          batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+        except asyncio.TimeoutError:
+          break
+
+      while len(batch) < self.batch_size and not self.queue.empty():
+        batch.append(self.queue.get_nowait())
+
+      results = inflect_batch([request for request, _ in batch])
+
+      for (_, future), result in zip(batch, results):
+        if not future.done():
+          future.set_result(result)
+
+  async def serve(self, reader, writer):
+    responses = asyncio.Queue(self.pending)
+    responder = asyncio.create_task(self.respond(responses, writer))
+
+    try:
+      while True:
+        line = await reader.readline()
+
+        if not line:
+          break
+
+        if not line.strip():
+          continue
+
+        await responses.put(await self.submit(line))
+    finally:
+      await responses.put(None)
+      await responder
+      writer.close()
+
+  async def submit(self, line):
+    future = asyncio.get_running_loop().create_future()
+
+    try:
+      identifier, request = get_request(json.loads(line))
+    except Exception as error:
+      future.set_result(('error', 'invalid request: %s' % error))
+      return None, future
+
+    await self.queue.put((request, future))
+    return identifier, future
+
+  async def respond(self, responses, writer):
+    connected = True
+
+    while True:
+      item = await responses.get()
+
+      if item is None:
+        break
+
+      identifier, future = item
+      key, value = await future
+
+      if not connected:
+        continue
+
+      try:
+        writer.write(get_response(identifier, key, value))
+        await writer.drain()
+      except ConnectionError:
+        connected = False
+
+async def serve(host='127.0.0.1', port=8470, unix=None, **options):
+  server = Server(**options)
+  listener = await server.start(host, port, unix)
+
+  async with listener:
+    await listener.serve_forever()
@@ -33,25 +33,11 @@ Turkish has 9 more cases (will be somehow implemented in future).
 
 '''
 from enum import Enum
-from .phonology import is_front, is_back
-from .suffix import Suffix
-from .functional import join, NOTHING, is_truthy, skip_falsy_and_join
-from .phonology import (get_last_vowel,
-                        get_vowel_symbol,
-                        Front,
-                        Back,
-                        is_back,
-                        voice,
-                        is_front,
-                        ends_with_consonant,
-                        harmony,
-                        SOFTENING_SOUNDS,
-                        VOICELESS_CONSONANTS,
-                        UNROUNDED_BACK_VOWELS,
-                        ROUNDED_BACK_VOWELS,
-                        UNROUNDED_FRONT_VOWELS,
-                        ROUNDED_FRONT_VOWELS)
+from .suffix import Suffix, Template
+from .phonology import voice
 from .predication import Person
+from .pronoun import PRONOUNS, decline
+from .normalization import get_token
 
 class GrammaticalCase(Enum):
   NOMINATIVE = 1
@@ -61,6 +47,23 @@ class GrammaticalCase(Enum):
   ABLATIVE = 5
   LOCATIVE = 6
 
+POSSESSIVE = {
+  (Person.FIRST, False): Template('-(I)m', softens=True, tags=('POSS.1SG',)),
+  (Person.SECOND, False): Template('-(I)n', softens=True, tags=('POSS.2SG',)),
+  (Person.THIRD, False): Template('-(s)I', softens=True, tags=('POSS.3SG',)),
+  (Person.FIRST, True): Template('-(I)mIz', softens=True, tags=('POSS.1PL',)),
+  (Person.SECOND, True): Template('-(I)nIz', softens=True, tags=('POSS.2PL',)),
+  (Person.THIRD, True): Template('-lArI', tags=('POSS.3PL',)),
+}
+
+CASES = {
+  GrammaticalCase.GENITIVE: Suffix.GENITIVE,
+  GrammaticalCase.DATIVE: Suffix.DATIVE,
+  GrammaticalCase.ACCUSATIVE: Suffix.ACCUSATIVE,
+  GrammaticalCase.ABLATIVE: Suffix.ABLATIVE,
+  GrammaticalCase.LOCATIVE: Suffix.LOCATIVE,
+}
+
 def get_case_processor(case):
   return {
     GrammaticalCase.NOMINATIVE: nominative,
@@ -97,14 +100,7 @@ def ablative(text):
   açlık[tan] öldüm
   ```
   '''
-  [*head, endswith] = text
-
-  if endswith in VOICELESS_CONSONANTS:
-    suffix = Suffix.TAN if is_back(text) else Suffix.TEN
-  else:
-    suffix = Suffix.DAN if is_back(text) else Suffix.DEN
-
-  return join(*head, endswith, suffix)
+  return Suffix.ABLATIVE(text)
 
 def accusative(text, voicer=voice):
   '''
@@ -119,27 +115,20 @@ def accusative(text, voicer=voice):
   aday[ı] yedim
   evim[i] yaptım
   üzüm[ü] pişirdim
+  ```
+
+  ✎︎ tests
+  ```python
+  >>> accusative('aday')
+  'adayı'
+  >>> accusative('elma')
+  'elmayı'
+  >>> accusative('kitap')
+  'kitabı'
+
   ```
   '''
-  last_vowel = get_last_vowel(text)
-  sound = get_vowel_symbol(last_vowel)
-
-  for (vowels, affix) in (
-    (UNROUNDED_BACK_VOWELS, Back.I),
-    (UNROUNDED_FRONT_VOWELS, Front.I),
-    (ROUNDED_BACK_VOWELS, Back.U),
-    (ROUNDED_FRONT_VOWELS, Front.U),
-  ):
-    if sound in vowels:
-      break
-
-  return skip_falsy_and_join(
-    voicer(text),
-    # if ends with a vowel, echo the genitive
-    # sound ⟨n⟩ right before the voiced suffix
-    #not ends_with_consonant(text) and Suffix.Y,
-    affix.value,
-  )
+  return Suffix.ACCUSATIVE(text, voicer)
 
 def genitive(text):
   '''
@@ -156,33 +145,7 @@ def genitive(text):
   mari[i] nie ma w domu (maria is not at home)
   ```
   '''
-  last_vowel = get_last_vowel(text)
-  sound = get_vowel_symbol(last_vowel)
-
-  for (vowels, affix) in (
-    (UNROUNDED_BACK_VOWELS, Back.I),
-    (UNROUNDED_FRONT_VOWELS, Front.I),
-    (ROUNDED_BACK_VOWELS, Back.U),
-    (ROUNDED_FRONT_VOWELS, Front.U),
-  ):
-    if sound in vowels:
-      break
-
-  return skip_falsy_and_join(
-    # nominative form
-    voice(text),
-
-    # if ends with a vowel, echo the genitive
-    # sound ⟨n⟩ right before the voiced suffix
-    not ends_with_consonant(text)
-    and Suffix.N,
-
-    # ⟨a⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩
-    affix.value,
-
-    # genitive sound ⟨n⟩
-    Suffix.N,
-  )
+  return Suffix.GENITIVE(text)
 
 
 def possesive(text,whom,is_plural = False):
@@ -204,42 +167,7 @@ def possesive(text,whom,is_plural = False):
   ```
   '''
 
-  states = {
-      Person.FIRST: "m",
-      Person.SECOND: "n",
-      Person.THIRD: NOTHING
-  }
-
-
-  last_vowel = get_last_vowel(text)
-  symbol = get_vowel_symbol(last_vowel)
-
-  if is_plural and whom == Person.THIRD:
-      if is_front(last_vowel):
-        symbol = Front.E
-        suffix = join("ler", harmony(symbol).value)
-      else:
-        symbol = Back.A
-        suffix = join("lar", harmony(symbol).value)
-
-  elif is_plural:
-      suffix = join(states[whom],harmony(symbol).value, Suffix.Z)
-  else:
-      suffix = states[whom]
-
-  if ends_with_consonant(text):
-    if whom == Person.THIRD and is_plural:
-      return join(text, suffix)
-    else:
-      return join(voice(text), harmony(symbol).value, suffix)
-
-  else:
-    if whom == Person.THIRD and is_plural:
-        return join(voice(text), suffix)
-    elif whom == Person.THIRD and is_plural == False:
-        return join(voice(text), Suffix.S, harmony(symbol).value)
-    else:
-        return join(voice(text), suffix)
+  return POSSESSIVE[whom, is_plural](text)
 
 def dative(text):
   '''
@@ -253,25 +181,7 @@ def dative(text):
   maria jacobī potum dedit (maria gave jacob a drink)
   ```
   '''
-  last_vowel = get_last_vowel(text)
-  sound = get_vowel_symbol(last_vowel)
-
-  if is_front(last_vowel):
-    symbol = Front.E
-  else:
-    symbol = Back.A
-
-  return skip_falsy_and_join(
-    # nominative form
-    voice(text),
-
-    # if ends with a vowel, echo the genitive
-    # sound ⟨n⟩ right before the voiced suffix
-    not ends_with_consonant(text) and Suffix.Y,
-
-    # ⟨e⟩ ⟨a⟩
-    symbol.value,
-  )
+  return Suffix.DATIVE(text)
 
 def locative(text):
   '''
@@ -286,35 +196,51 @@ def locative(text):
   yorum[da] iyi beatler var.
   kalem[de] güzel uç var.
   ```
-  '''
-  last_vowel = get_last_vowel(text)
-  sound = get_vowel_symbol(last_vowel)
-
-  if is_front(last_vowel):
-    symbol = Front.E
-  else:
-    symbol = Back.A
 
-  return skip_falsy_and_join(
-    text,
+  ✎︎ tests
+  ```python
+  >>> locative('bahçe')
+  'bahçede'
+  >>> locative('kitap')
+  'kitapta'
+  >>> locative('ses')
+  'seste'
 
-    # ⟨d⟩ or ⟨t⟩
-    Suffix.T if text[-1] in SOFTENING_SOUNDS else Suffix.D,
-
-    # ⟨e⟩ or ⟨a⟩
-    symbol.value,
-  )
+  ```
+  '''
+  return Suffix.LOCATIVE(text)
 
 def subject(
   stem,
   is_plural=False,
   case=GrammaticalCase.NOMINATIVE,
 ):
-  if is_plural:
-    suffix = \
-      Suffix.LER if is_front(stem) else Suffix.LAR
-  else:
-    suffix = NOTHING
+  '''
+  ## subject
+  a noun in a case, in the plural if asked. personal pronouns are
+  looked up in `kefir.pronoun` instead, and a stem that is not
+  normal is inflected through `kefir.normalization`.
+
+  ✎︎ tests
+  ```python
+  >>> subject('kitap', True, GrammaticalCase.DATIVE)
+  'kitaplara'
+  >>> subject('ben', case=GrammaticalCase.DATIVE)
+  'bana'
+  >>> subject('o', True, GrammaticalCase.GENITIVE)
+  'onların'
+  >>> subject('Kitap', True, GrammaticalCase.DATIVE)
+  'Kitaplara'
+
+  ```
+  '''
+  token = get_token(stem)
+
+  if token is not None:
+    return token.restore(subject(token.text, is_plural, case))
+
+  if stem in PRONOUNS:
+    return decline(stem, is_plural, case)
 
   processor = get_case_processor(case)
-  return processor(join(stem, suffix))
+  return processor(Suffix.PLURAL(stem) if is_plural else stem)
@@ -1,37 +1,650 @@
 '''
-TODO: Suffix should subclass Enum
+# Suffix Templates
+
+Turkish suffixes are written with archiphonemes, capital letters
+standing for a sound that takes its final shape from the stem:
+
+  ⟨A⟩ ⟨a⟩ ⟨e⟩ (two-fold vowel harmony)
+  ⟨I⟩ ⟨ı⟩ ⟨i⟩ ⟨u⟩ ⟨ü⟩ (four-fold vowel harmony)
+  ⟨D⟩ ⟨d⟩ ⟨t⟩ (consonant harmony)
+  ⟨C⟩ ⟨c⟩ ⟨ç⟩ (consonant harmony)
+
+Sounds in parentheses are buffers: a consonant buffer such as (y),
+(n) or (s) shows up only after a vowel, a vowel buffer such as (I)
+only after a consonant.
+
+  -DAn    dal[dan], ağaç[tan], ev[den]
+  -(y)Im  elma[yım], üzüm[üm]
+  -(y)DI  dalda[ydı], yap[tı]
+  -mAktA  gel[mekte], dal[makta]
+
+A bar marks a boundary between morphemes of one template, which
+are tagged for segmentation: `-(y)|DI|m` with the tags COP, PAST
+and 1SG segments daldaydım as dal|da|y|dı|m.
+
+Templates are compiled once, at import time, into a table of
+allomorphs indexed by the phonological class key of the stem
+(see `kefir.phonology.get_key`), so attaching a suffix is one
+table lookup and one concatenation.
+
+The case and copula templates are constants of `Suffix`, and the
+aspect templates of `Aspect`. The string constants `Suffix` had
+before (`Suffix.LAR`, `Suffix.DAN`, `Suffix.FUTURE`, ...) keep their
+old values and are deprecated.
 '''
-class Suffix:
-  NEGATIVE = 'değil'
-  IMPERFECT = 'yor'
-  FUTURE = 'ecek'
-  PROGRESSIVE = 'mekte'
-  NECESSITY = 'meli'
-  IMPOTENTIAL = 'eme'
-
-  LAR = 'lar'
-  LER = 'ler'
-  DEN = 'den'
-  DAN = 'dan'
-  TAN = 'tan'
-  TEN = 'ten'
-  NIZ = 'niz'
-  SIN = 'sin'
-  MAK = 'mak'
-  MEK = 'mek'
-
-  SE = 'se'
-  SA = 'sa'
-  IZ = 'iz'
-
-  N = 'n'
-  M = 'm'
-  Y = 'y'
-  D = 'd'
-  T = 't'
-  R = 'r'
-  S = 's'
-  Z = 'z'
-  K = 'k'
+import warnings
+from array import array
+from collections import namedtuple
+
+from .functional import join
+from .irregular import IRREGULARS
+from .normalization import get_token
+from .phonology import (analyze,
+                        voice,
+                        MissingVowelSound,
+                        get_key,
+                        get_vowel_class,
+                        KEYS,
+                        FEATURES,
+                        FINAL_CLASSES,
+                        VOWEL,
+                        FINAL_VOWEL,
+                        FINAL_VOICED,
+                        FINAL_VOICELESS,
+                        FINAL_SOFTENING)
+
+ARCHIPHONEMES = {
+  'A': lambda vowel_class, final_class: 'ae'[vowel_class & 1],
+  'I': lambda vowel_class, final_class: 'ıiuü'[vowel_class],
+  'D': lambda vowel_class, final_class: (
+    't' if final_class in (FINAL_VOICELESS, FINAL_SOFTENING) else 'd'
+  ),
+  'C': lambda vowel_class, final_class: (
+    'ç' if final_class in (FINAL_VOICELESS, FINAL_SOFTENING) else 'c'
+  ),
+}
+
+VOCALIC_ARCHIPHONEMES = {'A', 'I'}
+
+BOUNDARY = '|'
+
+def tokenize(template):
+  '''
+  ## tokenize
+  splits a template into sounds and buffers.
+
+  ✎︎ tests
+  ```python
+  >>> tokenize('-(y)DIm')
+  [('y',), 'D', 'I', 'm']
+  >>> tokenize('-(y)|DI|m')
+  [('y',), '|', 'D', 'I', '|', 'm']
+
+  ```
+  '''
+  tokens = []
+  buffer = None
+
+  for symbol in template.lstrip('-'):
+    if symbol == '(':
+      buffer = []
+    elif symbol == ')':
+      tokens.append(tuple(buffer))
+      buffer = None
+    elif buffer is not None:
+      buffer.append(symbol)
+    else:
+      tokens.append(symbol)
+
+  return tokens
+
+def realize(symbol, vowel_class, final_class):
+  if symbol in ARCHIPHONEMES:
+    return ARCHIPHONEMES[symbol](vowel_class, final_class)
+
+  return symbol
+
+def is_vocalic(symbol):
+  return symbol in VOCALIC_ARCHIPHONEMES or bool(
+    FEATURES.get(symbol, 0) & VOWEL
+  )
+
+def advance(vowel_class, final_class, sound):
+  features = FEATURES.get(sound, 0)
+
+  if features & VOWEL:
+    return get_vowel_class(features), FINAL_VOWEL
+
+  return vowel_class, FINAL_CLASSES.get(sound, FINAL_VOWEL)
+
+def get_rules(language):
+  if language is None:
+    return realize, is_vocalic, advance
+
+  return language.realize, language.is_vocalic, language.advance
+
+def resolve(template, key, language=None):
+  '''
+  ## resolve
+  the allomorph of a template after a stem of the given class,
+  together with the class of the word it makes and the offsets
+  of the morpheme boundaries in the allomorph. the sounds are
+  turkish unless a `kefir.language.Language` is given.
+
+  ✎︎ tests
+  ```python
+  >>> resolve('-(y)DIm', analyze('dalda').key)[0]
+  'ydım'
+  >>> resolve('-(y)DIm', analyze('açık').key)[0]
+  'tım'
+  >>> resolve('-(n)In', analyze('üzüm').key)[0]
+  'ün'
+  >>> resolve('-(y)|DI|m', analyze('dalda').key)[2]
+  (1, 3)
+
+  ```
+  '''
+  realizer, vocalic, step = get_rules(language)
+  vowel_class, final_class = key >> 2, key & 3
+  sounds = []
+  boundaries = []
+
+  for token in tokenize(template):
+    if token == BOUNDARY:
+      boundaries.append(len(sounds))
+      continue
+
+    if isinstance(token, tuple):
+      if vocalic(token[0]) == (final_class == FINAL_VOWEL):
+        continue
+    else:
+      token = (token,)
+
+    for symbol in token:
+      symbol = realizer(symbol, vowel_class, final_class)
+      vowel_class, final_class = step(vowel_class, final_class, symbol)
+      sounds.append(symbol)
+
+  return (
+    join(*sounds),
+    get_key(vowel_class, final_class),
+    tuple(boundaries),
+  )
+
+def get_segments(suffix, boundaries, tags):
+  '''
+  ## get_segments
+  the end offset and tag of every morpheme of an allomorph,
+  leaving out the morphemes that came out empty.
+
+  ✎︎ tests
+  ```python
+  >>> get_segments('ydım', (1, 3), ('COP', 'PAST', '1SG'))
+  ((1, 'COP'), (3, 'PAST'), (4, '1SG'))
+  >>> get_segments('tım', (0, 2), ('COP', 'PAST', '1SG'))
+  ((2, 'PAST'), (3, '1SG'))
+
+  ```
+  '''
+  segments = []
+  start = 0
+
+  for end, tag in zip(boundaries + (len(suffix),), tags):
+    if end > start:
+      segments.append((end, tag))
+
+    start = end
+
+  return tuple(segments)
+
+def soften_key(key):
+  if key & 3 == FINAL_SOFTENING:
+    return key & ~3 | FINAL_VOICED
+
+  return key
+
+class Template:
+  '''
+  ## template
+  a compiled suffix template. its table holds, for every stem
+  class key, whether the stem softens, the allomorph to append
+  and the class key of the resulting word. templates compose
+  with `+`, which compiles the two tables into one.
+
+  a template has one tag for every morpheme its source marks with
+  bars, and for every stem class key the segments of its allomorph,
+  the end offset and tag of each morpheme in it. it keeps the
+  sources it was compiled from as its parts, so a
+  `kefir.language.Language` can compile it again for its sounds.
+  where a softening template starts with a vowel, an irregular stem
+  gives way to its alternate (see `kefir.irregular`). text that is
+  not normal is inflected through `kefir.normalization`, with the
+  suffix after the token as it is written.
+
+  ✎︎ tests
+  ```python
+  >>> locative = Template('-DA')
+  >>> locative('kitap'), locative('ev')
+  ('kitapta', 'evde')
+
+  >>> dative = Template('-(y)A', softens=True)
+  >>> dative('kitap'), dative('elma')
+  ('kitaba', 'elmaya')
+
+  >>> past = Template('-(y)DIm')
+  >>> (locative + past)('dal')
+  'daldaydım'
+
+  >>> past = Template('-(y)|DI|m', tags=('COP', 'PAST', '1SG'))
+  >>> past('dal'), past.source
+  ('daldım', '-(y)DIm')
+  >>> past.segments[analyze('dalda').key]
+  ((1, 'COP'), (3, 'PAST'), (4, '1SG'))
+
+  >>> dative('burun'), dative('hak'), locative('burun')
+  ('burna', 'hakka', 'burunda')
+
+  >>> locative('2024'), dative('ANKARA'), Template('-DAn')("Ankara'da")
+  ("2024'te", 'ANKARAYA', "Ankara'dadan")
+
+  ```
+  '''
+  __slots__ = ('source', 'table', 'segments', 'parts', 'alternates')
+
+  def __init__(
+    self,
+    source,
+    softens=False,
+    table=None,
+    tags=None,
+    segments=None,
+    parts=None,
+    language=None,
+    alternates=None,
+  ):
+    self.source = source.replace(BOUNDARY, '')
+    self.parts = parts or ((source, softens, tags),)
+
+    if table is None:
+      tags = tags or (None,) * (source.count(BOUNDARY) + 1)
+      compiled = [
+        self.compile(source, key, softens, tags, language)
+        for key in KEYS
+      ]
+      table = tuple(entry for entry, _ in compiled)
+      segments = tuple(segments for _, segments in compiled)
+      vocalic = get_rules(language)[1]
+      alternates = tuple(
+        softens and vocalic(suffix[:1])
+        for _, suffix, _ in table
+      )
+
+    self.table = table
+    self.segments = segments
+    self.alternates = alternates or (False,) * len(table)
+
+  @staticmethod
+  def compile(source, key, softens, tags, language=None):
+    softens = softens and key & 3 == FINAL_SOFTENING
+    suffix, next_key, boundaries = resolve(
+      source,
+      soften_key(key) if softens else key,
+      language,
+    )
+
+    if not suffix and softens:
+      next_key = soften_key(next_key)
+
+    return (softens, suffix, next_key), get_segments(suffix, boundaries, tags)
+
+  def __call__(self, text, voicer=voice):
+    if isinstance(text, WordBuilder):
+      return text.attach(self, voicer)
+
+    try:
+      profile = analyze(text)
+    except MissingVowelSound:
+      profile = None
+
+    if profile is None or not profile.is_normal:
+      token = get_token(text)
+
+      if token is not None:
+        return token.restore(self(token.text, voicer))
+
+      if profile is None:
+        profile = analyze(text)
+
+    softens, suffix, _ = self.table[profile.key]
+
+    if profile.alternate is not None and self.alternates[profile.key]:
+      return join(profile.alternate, suffix)
+
+    return join(voicer(text) if softens else text, suffix)
 
+  def __add__(self, other):
+    return self.compose(other)
+
+  def compose(self, other, voicer=voice):
+    '''
+    the template of this one followed by the other, softening the
+    end of this one with the voicer where the other asks for it.
+    '''
+    table = []
+    segments = []
+    alternates = []
+
+    for (softens, suffix, key), head, alternate in zip(
+      self.table,
+      self.segments,
+      self.alternates,
+    ):
+      softens_next, next_suffix, next_key = other.table[key]
+      alternates.append(alternate if suffix else other.alternates[key])
+      segments.append(head + tuple(
+        (len(suffix) + end, tag)
+        for end, tag in other.segments[key]
+      ))
+
+      if softens_next and suffix:
+        suffix = voicer(suffix)
+      elif softens_next:
+        softens = True
+
+      if softens_next and not next_suffix:
+        next_key = soften_key(next_key)
+
+      table.append((softens, join(suffix, next_suffix), next_key))
+
+    return Template(
+      join(self.source, other.source),
+      table=tuple(table),
+      segments=tuple(segments),
+      parts=self.parts + other.parts,
+      alternates=tuple(alternates),
+    )
+
+  def __repr__(self):
+    return 'Template(%r)' % self.source
+
+class WordBuilder:
+  '''
+  ## word builder
+  a word under construction: its morphemes and the class key of
+  what has been built so far, which is all a suffix table needs.
+  attaching a suffix is one table lookup and one append, and only
+  softens the morpheme before it, so it does not depend on the
+  length of the word. the string is joined once, by `str`.
+
+  the case and copula functions accept a builder, attach to it in
+  place and return it.
+
+  ✎︎ tests
+  ```python
+  >>> word = WordBuilder('kitap')
+  >>> Suffix.PLURAL(Suffix.DATIVE(word)) is word
+  True
+  >>> word.morphemes, str(word)
+  (['kitab', 'a', 'lar'], 'kitabalar')
+
+  >>> from kefir import predicate, locative
+  >>> str(predicate(locative(WordBuilder('marul')), 'first', 'perfective', True))
+  'maruldaydık'
+
+  ```
+  '''
+  __slots__ = ('morphemes', 'key', 'alternate')
+
+  def __init__(self, stem):
+    self.morphemes = [stem]
+    self.key = None
+    self.alternate = None
+
+    if stem in IRREGULARS:
+      profile = analyze(stem)
+      self.key, self.alternate = profile.key, profile.alternate
+    else:
+      self.update(stem)
+
+  def update(self, text):
+    features = 0
+
+    for symbol in reversed(text):
+      features = FEATURES.get(symbol, 0)
+
+      if features & VOWEL:
+        break
+
+    if features & VOWEL:
+      vowel_class = get_vowel_class(features)
+    elif self.key is not None:
+      vowel_class = self.key >> 2
+    else:
+      return
+
+    self.key = get_key(
+      vowel_class,
+      FINAL_CLASSES.get(text[-1:], FINAL_VOWEL),
+    )
+
+  @property
+  def vowel_class(self):
+    return None if self.key is None else self.key >> 2
+
+  @property
+  def final_class(self):
+    return None if self.key is None else self.key & 3
+
+  def attach(self, template, voicer=voice):
+    if self.key is None:
+      raise MissingVowelSound
+
+    key = self.key
+    softens, suffix, self.key = template.table[key]
+
+    if self.alternate is not None and suffix:
+      if template.alternates[key]:
+        self.morphemes[-1], softens = self.alternate, False
+
+      self.alternate = None
+
+    if softens:
+      self.morphemes[-1] = voicer(self.morphemes[-1])
+
+    if suffix:
+      self.morphemes.append(suffix)
+
+    return self
+
+  def append(self, text, tag=None):
+    '''
+    appends text that is not a suffix template, such as a separate
+    word, and works out the class key from it. the tag is kept by
+    a `SegmentedWord`.
+    '''
+    self.morphemes.append(text)
+    self.update(text)
+    return self
+
+  def __str__(self):
+    return join(*self.morphemes)
+
+  def __repr__(self):
+    return 'WordBuilder(%r)' % str(self)
+
+class Segmentation(namedtuple(
+  'Segmentation',
+  ('surface', 'offsets', 'tags'),
+)):
+  '''
+  ## segmentation
+  a word with the end offset of every morpheme, the stem first, and
+  the tag of every morpheme after the stem.
+  '''
+  __slots__ = ()
+
+  @property
+  def morphemes(self):
+    starts = (0,) + tuple(self.offsets[:-1])
+    return [
+      self.surface[start:end]
+      for start, end in zip(starts, self.offsets)
+    ]
+
+  def __str__(self):
+    return BOUNDARY.join(self.morphemes)
+
+class SegmentedWord(WordBuilder):
+  '''
+  ## segmented word
+  a word builder that also keeps, for every suffix it attaches, the
+  segments of the allomorph from the suffix table. the offsets and
+  tags are laid out once, by `segmentation`, so segmenting does not
+  look at the text.
+
+  ✎︎ tests
+  ```python
+  >>> from kefir import predicate, locative
+  >>> word = predicate(locative(SegmentedWord('dal')), 'first', 'perfective', True)
+  >>> segmentation = word.segmentation()
+  >>> str(segmentation), segmentation.tags
+  ('dal|da|y|dı|k', ('LOC', 'COP', 'PAST', '1PL'))
+  >>> segmentation.offsets
+  array('I', [3, 5, 6, 8, 9])
+  >>> Suffix.LOCATIVE(SegmentedWord('a' * 70000)).segmentation().offsets
+  array('I', [70000, 70002])
+
+  >>> str(Suffix.ACCUSATIVE(SegmentedWord('burun')).segmentation())
+  'burn|u'
+
+  >>> negative = predicate(SegmentedWord('kitap'), 'third', 'negative')
+  >>> negative.segmentation().morphemes, negative.segmentation().tags
+  (['kitap', ' değil'], ('NEG',))
+
+  ```
+  '''
+  __slots__ = ('segments',)
+
+  def __init__(self, stem):
+    super().__init__(stem)
+    self.segments = []
+
+  def attach(self, template, voicer=voice):
+    key = self.key
+    count = len(self.morphemes)
+    super().attach(template, voicer)
+
+    if len(self.morphemes) > count:
+      self.segments.append(template.segments[key])
+
+    return self
+
+  def append(self, text, tag=None):
+    super().append(text)
+    self.segments.append(((len(text), tag),))
+    return self
+
+  def segmentation(self):
+    start = len(self.morphemes[0])
+    offsets = array('I', (start,))
+    tags = []
+
+    for morpheme, segments in zip(self.morphemes[1:], self.segments):
+      for end, tag in segments:
+        offsets.append(start + end)
+        tags.append(tag)
+
+      start += len(morpheme)
+
+    return Segmentation(str(self), offsets, tuple(tags))
+
+  def __repr__(self):
+    return 'SegmentedWord(%r)' % str(self.segmentation())
+
+class Deprecations(type):
+  '''
+  ## deprecations
+  the string constants `Suffix` had before templates keep their old
+  values, with a `DeprecationWarning` that names the template that
+  writes them now.
+
+  ✎︎ tests
+  ```python
+  >>> import warnings
+  >>> with warnings.catch_warnings(record=True) as caught:
+  ...   warnings.simplefilter('always')
+  ...   'kitap' + Suffix.LAR, Suffix.DAN, Suffix.N, Suffix.FUTURE
+  ('kitaplar', 'dan', 'n', 'ecek')
+  >>> str(caught[0].message), caught[0].category.__name__
+  ('Suffix.LAR is deprecated. use Suffix.PLURAL', 'DeprecationWarning')
+  >>> str(caught[2].message), str(caught[3].message)
+  ("Suffix.N is deprecated. use Template('-n')", 'Suffix.FUTURE is deprecated. use Aspect.FUTURE')
+  >>> Aspect.FUTURE('gel')
+  'gelecek'
+
+  ```
+  '''
+  def __getattr__(cls, name):
+    if name not in DEPRECATED:
+      raise AttributeError(
+        'type object %r has no attribute %r' % (cls.__name__, name),
+      )
+
+    value, replacement = DEPRECATED[name]
+    warnings.warn(
+      'Suffix.%s is deprecated. use %s' % (name, replacement),
+      DeprecationWarning,
+      stacklevel=2,
+    )
+    return value
+
+class Suffix(metaclass=Deprecations):
+  NEGATIVE = 'değil'
   DELIMITER = ' '
+
+  PLURAL = Template('-lAr', tags=('PL',))
+
+  GENITIVE = Template('-(n)In', softens=True, tags=('GEN',))
+  DATIVE = Template('-(y)A', softens=True, tags=('DAT',))
+  ACCUSATIVE = Template('-(y)I', softens=True, tags=('ACC',))
+  ABLATIVE = Template('-DAn', tags=('ABL',))
+  LOCATIVE = Template('-DA', tags=('LOC',))
+
+  TOBE = Template('-DIr', tags=('GNR',))
+  INFERENTIAL = Template('-(y)|mIş', tags=('COP', 'EVID'))
+  CONDITIONAL = Template('-(y)|sA', tags=('COP', 'COND'))
+
+class Aspect:
+  IMPERFECTIVE = Template('-(I)yor', tags=('IPFV',))
+  FUTURE = Template('-(y)AcAk', tags=('FUT',))
+  PROGRESSIVE = Template('-mAktA', tags=('PROG',))
+  NECESSITATIVE = Template('-mAlI', tags=('NEC',))
+  IMPOTENTIAL = Template('-(y)AmA', softens=True, tags=('IMPOT',))
+
+DEPRECATED = {
+  'IMPERFECT': ('yor', 'Aspect.IMPERFECTIVE'),
+  'FUTURE': ('ecek', 'Aspect.FUTURE'),
+  'PROGRESSIVE': ('mekte', 'Aspect.PROGRESSIVE'),
+  'NECESSITY': ('meli', 'Aspect.NECESSITATIVE'),
+  'IMPOTENTIAL': ('eme', 'Aspect.IMPOTENTIAL'),
+
+  'LAR': ('lar', 'Suffix.PLURAL'),
+  'LER': ('ler', 'Suffix.PLURAL'),
+  'DEN': ('den', 'Suffix.ABLATIVE'),
+  'DAN': ('dan', 'Suffix.ABLATIVE'),
+  'TAN': ('tan', 'Suffix.ABLATIVE'),
+  'TEN': ('ten', 'Suffix.ABLATIVE'),
+  'NIZ': ('niz', "Template('-nIz')"),
+  'SIN': ('sin', "Template('-sIn')"),
+  'MAK': ('mak', "Template('-mAk')"),
+  'MEK': ('mek', "Template('-mAk')"),
+
+  'SE': ('se', 'Suffix.CONDITIONAL'),
+  'SA': ('sa', 'Suffix.CONDITIONAL'),
+  'IZ': ('iz', "Template('-(y)Iz')"),
+
+  **{
+    symbol.upper(): (symbol, "Template('-%s')" % symbol)
+    for symbol in 'nmydtrszk'
+  },
+}
@@ -0,0 +1,509 @@
+'''
+# Finite-State Transducer
+
+The suffix tables of `kefir.subject` and `kefir.predication`
+compiled into one deterministic (subsequential) transducer. Its
+input is the letters of a stem followed by tags, its output the
+inflected form:
+
+    d a l <locative> <perfective.first.plural>  →  daldaydık
+
+A state remembers what the suffix tables need to know about the
+word so far: the class of its last vowel, the class of its final
+sound and, when that sound may soften (⟨p⟩ ⟨ç⟩ ⟨t⟩ ⟨k⟩), the sound
+itself, held back until the next suffix decides whether it is
+written softened. Generation takes one transition per input
+symbol, so it runs in time linear in the output.
+
+Tags follow the order of the functions they replace:
+
+  - `plural`
+  - a case, `genitive`, `dative`, `accusative`, `ablative` or
+    `locative`, the nominative has no tag
+  - a copula with its person, `perfective.first.plural`, or
+    `negative`, which is written as a separate word. the zero
+    copula has no tag
+  - or instead of a case and a copula, a possessive,
+    `possessive.first.plural`
+
+Irregular stems (see `kefir.irregular`) are not spelled out letter
+by letter: every stem of the lexicon is one symbol on an arc from
+the start. The arc writes what the stem and its alternate have in
+common and leads to a state holding back the rest of both, so the
+next suffix picks the stem, its softened variant or its alternate.
+The arcs follow the lexicon as it changes.
+
+Reading the transitions the other way round gives analysis: every
+path whose outputs spell a surface form is a (stem, tags) reading.
+'''
+import json
+from collections import namedtuple
+
+from itertools import islice
+from os.path import commonprefix
+
+from .functional import join
+from .irregular import IRREGULARS, register
+from .phonology import (analyze,
+                        FEATURES,
+                        FINAL_CLASSES,
+                        SOFTENING_SOUNDS,
+                        VOWEL,
+                        FINAL_VOWEL,
+                        FINAL_SOFTENING,
+                        MissingVowelSound,
+                        get_key,
+                        get_vowel_class)
+from .predication import Copula, COPULAS
+from .subject import CASES, POSSESSIVE
+from .suffix import Suffix, Template
+
+STEM = 0
+NUMBER = 1
+CASE = 2
+DONE = 3
+WORD = 4
+
+State = namedtuple(
+  'State',
+  ('phase', 'vowel_class', 'final_class', 'pending', 'alternate'),
+  defaults=('',),
+)
+
+Path = namedtuple('Path', ('stem', 'tags'))
+
+NEGATIVE = Template(join(Suffix.DELIMITER, Suffix.NEGATIVE))
+
+def get_tag(category, person, is_plural):
+  return '%s.%s%s' % (category, person.value, '.plural' if is_plural else '')
+
+def get_tags():
+  '''
+  ## tags
+  every tag with the phases it may follow, the phase it leads
+  to and the suffix template it writes.
+  '''
+  yield 'plural', (STEM, WORD), NUMBER, Suffix.PLURAL
+
+  for case, template in CASES.items():
+    yield case.name.lower(), (STEM, WORD, NUMBER), CASE, template
+
+  yield 'negative', (STEM, WORD, NUMBER, CASE), DONE, NEGATIVE
+
+  for copula, endings in COPULAS.items():
+    if copula is Copula.ZERO:
+      continue
+
+    for (person, is_plural), template in endings.items():
+      yield (
+        get_tag(copula.value, person, is_plural),
+        (STEM, WORD, NUMBER, CASE),
+        DONE,
+        template,
+      )
+
+  for (person, is_plural), template in POSSESSIVE.items():
+    yield (
+      get_tag('possessive', person, is_plural),
+      (STEM, WORD, NUMBER),
+      DONE,
+      template,
+    )
+
+TAGS = tuple(get_tags())
+
+def read(state, symbol):
+  phase, vowel_class, final_class, pending, _ = state
+  features = FEATURES.get(symbol, 0)
+
+  if features & VOWEL:
+    vowel_class, final_class = get_vowel_class(features), FINAL_VOWEL
+  else:
+    final_class = FINAL_CLASSES.get(symbol, FINAL_VOWEL)
+
+  if final_class == FINAL_SOFTENING:
+    return pending, State(phase, vowel_class, final_class, symbol)
+
+  return pending + symbol, State(phase, vowel_class, final_class, '')
+
+def read_word(stem):
+  '''
+  the output of the arc of an irregular stem and the state it leads
+  to, holding back where the stem and its alternate differ and the
+  sound that may soften.
+  '''
+  profile = analyze(stem)
+  alternate = profile.alternate or ''
+  size = len(commonprefix((stem, alternate))) if alternate else len(stem)
+
+  if profile.can_soften:
+    size = min(size, len(stem) - 1)
+
+  if alternate:
+    size = min(size, len(alternate) - 1)
+
+  return stem[:size], State(
+    WORD,
+    profile.key >> 2,
+    profile.key & 3,
+    stem[size:],
+    alternate[size:],
+  )
+
+def attach(state, template, phase):
+  _, vowel_class, final_class, pending, alternate = state
+  key = get_key(vowel_class or 0, final_class)
+  softens, suffix, next_key = template.table[key]
+
+  if alternate and template.alternates[key]:
+    base = alternate
+  elif softens:
+    base = pending[:-1] + SOFTENING_SOUNDS[pending[-1]]
+  else:
+    base = pending
+
+  if suffix[-1:] in SOFTENING_SOUNDS:
+    output, pending, alternate = base + suffix[:-1], suffix[-1], ''
+  elif suffix or softens:
+    output, pending, alternate = base + suffix, '', ''
+  else:
+    output = ''
+
+  return output, State(phase, next_key >> 2, next_key & 3, pending, alternate)
+
+def expand(states, arcs, fallback):
+  '''
+  writes down the transitions of every state that has none yet,
+  walking every state reachable from them.
+  '''
+  numbers = {state: number for number, state in enumerate(states)}
+
+  def get_number(state):
+    if state not in numbers:
+      numbers[state] = len(states)
+      states.append(state)
+
+    return numbers[state]
+
+  for state in islice(states, len(arcs), None):
+    transitions = {}
+    other = None
+
+    if state.phase == STEM:
+      for symbol in FEATURES:
+        output, target = read(state, symbol)
+        transitions[symbol] = output, get_number(target)
+
+      output, target = read(state, '')
+      other = output, get_number(target)
+
+    for tag, phases, phase, template in TAGS:
+      if state.vowel_class is None and template is not NEGATIVE:
+        continue
+
+      if state.phase in phases:
+        output, target = attach(state, template, phase)
+        transitions[tag] = output, get_number(target)
+
+    arcs.append(transitions)
+    fallback.append(other)
+
+def compile_transducer():
+  '''
+  ## compile
+  walks every state reachable from the empty stem and from the
+  irregular stems and writes down its transitions.
+  '''
+  states = [State(STEM, None, FINAL_VOWEL, '')]
+  arcs = []
+  fallback = []
+  expand(states, arcs, fallback)
+
+  transducer = Transducer(
+    [tuple(state) for state in states],
+    arcs,
+    fallback,
+    [state.pending for state in states],
+  )
+  transducer.forget(IRREGULARS)
+  transducer.learn()
+  return transducer
+
+class Transducer:
+  '''
+  ## transducer
+  ✎︎ tests
+  ```python
+  >>> TRANSDUCER.generate('dal', 'locative', 'perfective.first.plural')
+  'daldaydık'
+  >>> TRANSDUCER.generate('kitap', 'possessive.first')
+  'kitabım'
+  >>> TRANSDUCER.generate('ağaç', 'plural', 'ablative')
+  'ağaçlardan'
+
+  >>> TRANSDUCER.analyze('kitabım', stems={'kitap'})
+  [Path(stem='kitap', tags=('personal.first',)), Path(stem='kitap', tags=('possessive.first',))]
+
+  >>> Transducer.loads(TRANSDUCER.dumps()).generate('gel', 'future.third')
+  'gelecek'
+
+  >>> [TRANSDUCER.generate(stem, 'accusative') for stem in ('burun', 'hak', 'top', 'saat')]
+  ['burnu', 'hakkı', 'topu', 'saati']
+  >>> TRANSDUCER.generate('burun', 'plural', 'accusative')
+  'burunları'
+  >>> TRANSDUCER.analyze('burnu', stems={'burun'})[0], TRANSDUCER.analyze('burunu', stems={'burun'})
+  (Path(stem='burun', tags=('accusative',)), [])
+
+  every path against the functions it replaces, over a fixed set of
+  stems:
+
+  >>> from kefir.subject import subject, possesive, GrammaticalCase
+  >>> from kefir.predication import Person, predicate
+  >>> def expected(stem, tags):
+  ...   is_plural, case = 'plural' in tags, GrammaticalCase.NOMINATIVE
+  ...   for tag in tags:
+  ...     if tag.upper() in GrammaticalCase.__members__:
+  ...       case = GrammaticalCase[tag.upper()]
+  ...   category, *person = tags[-1].split('.') if tags else ('',)
+  ...   if category == 'possessive':
+  ...     return possesive(subject(stem, is_plural), Person(person[0]), len(person) > 1)
+  ...   form = subject(stem, is_plural, case)
+  ...   if category == 'negative' or person:
+  ...     return predicate(form, (person or ['third'])[0], category, len(person) > 1)
+  ...   return form
+  >>> cases = [(tag,) for tag, _, phase, _ in TAGS if phase == CASE]
+  >>> endings = [(tag,) for tag, _, phase, _ in TAGS if phase == DONE]
+  >>> sequences = [
+  ...   (*number, *case, *ending)
+  ...   for number in ((), ('plural',))
+  ...   for case in ((), *cases)
+  ...   for ending in ((), *endings)
+  ...   if not (case and ending and ending[0].startswith('possessive'))
+  ... ]
+  >>> stems = (
+  ...   'dal', 'kitap', 'ağaç', 'elma', 'gönül', 'süt',
+  ...   'renk', 'kürsü', 'yolcu', 'burun', 'hak', 'saat',
+  ... )
+  >>> [
+  ...   (stem, tags)
+  ...   for stem in stems
+  ...   for tags in sequences
+  ...   if TRANSDUCER.generate(stem, *tags) != expected(stem, tags)
+  ... ]
+  []
+  >>> len(stems) * len(sequences)
+  8208
+
+  ```
+  '''
+  __slots__ = ('states', 'arcs', 'fallback', 'finals', 'inverse', 'unlearned')
+
+  def __init__(self, states, arcs, fallback, finals):
+    self.states = states
+    self.arcs = arcs
+    self.fallback = fallback
+    self.finals = finals
+    self.inverse = None
+    self.unlearned = set()
+
+  def __len__(self):
+    return len(self.states)
+
+  def __repr__(self):
+    return 'Transducer(%d states, %d transitions)' % (
+      len(self.states),
+      sum(map(len, self.arcs)),
+    )
+
+  def is_word(self, stem):
+    arc = self.arcs[0].get(stem)
+    return arc is not None and self.states[arc[1]][0] == WORD
+
+  def forget(self, stems):
+    '''
+    called by the lexicon with the stems that changed, or `None` when
+    it is cleared. their arcs are redone the next time the transducer
+    is used, so loading a lexicon costs nothing here.
+    '''
+    if stems is None:
+      start = self.arcs[0]
+
+      for symbol in [symbol for symbol in start if self.is_word(symbol)]:
+        del start[symbol]
+
+      stems = IRREGULARS
+
+    self.unlearned.update(stems)
+
+  def learn(self):
+    '''
+    writes the arcs of the stems the lexicon changed since the last
+    time, and the states they lead to.
+    '''
+    start = self.arcs[0]
+    states = [State(*state) for state in self.states]
+    numbers = {state: number for number, state in enumerate(states)}
+
+    for stem in self.unlearned:
+      if stem not in IRREGULARS:
+        start.pop(stem, None)
+        continue
+
+      output, state = read_word(stem)
+
+      if state not in numbers:
+        numbers[state] = len(states)
+        states.append(state)
+
+      start[stem] = output, numbers[state]
+
+    size = len(self.states)
+    expand(states, self.arcs, self.fallback)
+    self.states.extend(map(tuple, states[size:]))
+    self.finals.extend(state.pending for state in states[size:])
+    self.unlearned.clear()
+    self.inverse = None
+
+  def generate(self, stem, *tags):
+    if self.unlearned:
+      self.learn()
+
+    state = 0
+    output = []
+    arc = self.arcs[0].get(stem)
+
+    if arc is not None and self.states[arc[1]][0] == WORD:
+      output.append(arc[0])
+      state = arc[1]
+      stem = ''
+
+    for symbol in stem:
+      arc = self.arcs[state].get(symbol)
+
+      if arc is None:
+        prefix, state = self.fallback[state]
+        output.append(prefix + symbol)
+      else:
+        output.append(arc[0])
+        state = arc[1]
+
+    for tag in tags:
+      arc = self.arcs[state].get(tag)
+
+      if arc is None:
+        if self.states[state][1] is None:
+          raise MissingVowelSound
+
+        raise Exception('invalid tag %r. options: %s' % (
+          tag,
+          ', '.join(symbol for symbol in self.arcs[state] if len(symbol) > 1),
+        ))
+
+      output.append(arc[0])
+      state = arc[1]
+
+    output.append(self.finals[state])
+    return ''.join(output)
+
+  def invert(self):
+    inverse = []
+
+    for transitions in self.arcs:
+      index = {}
+
+      for symbol, (output, target) in transitions.items():
+        index.setdefault(output[:1], []).append((output, symbol, target))
+
+      inverse.append(index)
+
+    self.inverse = inverse
+    return inverse
+
+  def analyze(self, surface, stems=None):
+    '''
+    every (stem, tags) path whose output is the surface form. without
+    a set of known stems every prefix of the word is a candidate.
+    '''
+    if self.unlearned:
+      self.learn()
+
+    inverse = self.inverse or self.invert()
+    paths = []
+    stack = [(0, 0, '', (), False)]
+
+    while stack:
+      state, position, stem, tags, is_word = stack.pop()
+      final = self.finals[state]
+
+      if (
+        len(surface) - position == len(final)
+        and surface.endswith(final)
+        and (stems is None or stem in stems)
+        and (is_word or not self.is_word(stem))
+      ):
+        paths.append(Path(stem, tags))
+
+      index = inverse[state]
+      candidates = index.get(surface[position:position + 1], ())
+
+      for output, symbol, target in (*candidates, *index.get('', ())):
+        if not surface.startswith(output, position):
+          continue
+
+        position_next = position + len(output)
+
+        if self.states[target][0] == WORD and not stem:
+          stack.append((target, position_next, symbol, tags, True))
+        elif len(symbol) == 1:
+          stack.append((target, position_next, stem + symbol, tags, is_word))
+        else:
+          stack.append((target, position_next, stem, (*tags, symbol), is_word))
+
+      other = self.fallback[state]
+
+      if other is not None and position + len(other[0]) < len(surface):
+        prefix, target = other
+        symbol = surface[position + len(prefix)]
+
+        if symbol not in FEATURES and surface.startswith(prefix, position):
+          stack.append((
+            target,
+            position + len(prefix) + 1,
+            stem + symbol,
+            tags,
+            is_word,
+          ))
+
+    return sorted(paths)
+
+  def to_dict(self):
+    if self.unlearned:
+      self.learn()
+
+    return {
+      'states': self.states,
+      'arcs': self.arcs,
+      'fallback': self.fallback,
+      'finals': self.finals,
+    }
+
+  def dumps(self):
+    return json.dumps(self.to_dict(), ensure_ascii=False)
+
+  @staticmethod
+  def loads(text):
+    data = json.loads(text)
+
+    return Transducer(
+      list(map(tuple, data['states'])),
+      [
+        {symbol: tuple(arc) for symbol, arc in transitions.items()}
+        for transitions in data['arcs']
+      ],
+      [arc and tuple(arc) for arc in data['fallback']],
+      data['finals'],
+    )
+
+TRANSDUCER = compile_transducer()
+
+register(TRANSDUCER.forget)
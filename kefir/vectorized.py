@@ -0,0 +1,121 @@
+'''
+# Vectorized Phonology
+
+Classifies whole arrays of stems at once. Stems are laid out as a
+fixed-width matrix of UTF-32 codepoints, every codepoint is mapped
+through the phonological feature table of `kefir.phonology`, and the
+per-character work happens in NumPy instead of a Python loop.
+
+Requires NumPy (`pip install kefir[numpy]`).
+'''
+from collections import namedtuple
+
+import numpy
+
+from .phonology import (FEATURES,
+                        CONSONANT,
+                        VOWEL,
+                        FRONT,
+                        ROUNDED)
+
+FEATURE_TABLE = numpy.zeros(
+  max(map(ord, FEATURES)) + 2,
+  dtype=numpy.uint8,
+)
+
+for symbol, features in FEATURES.items():
+  FEATURE_TABLE[ord(symbol)] = features
+
+Classification = namedtuple('Classification', (
+  'last_vowel',
+  'is_front',
+  'is_rounded',
+  'final',
+  'missing_vowel',
+))
+
+def encode(stems):
+  '''
+  ## encode
+  lays a sequence (or a numpy unicode array) of stems out
+  as a matrix of codepoints, one row per stem, padded
+  with zeros.
+
+  ✎︎ tests
+  ```python
+  >>> encode(['dal', 'elma']).tolist()
+  [[100, 97, 108, 0], [101, 108, 109, 97]]
+  >>> encode([]).shape
+  (0, 1)
+
+  ```
+  '''
+  stems = numpy.ascontiguousarray(stems, dtype=numpy.str_)
+
+  if not len(stems):
+    return numpy.zeros((0, 1), dtype=numpy.uint32)
+
+  if not stems.dtype.itemsize:
+    stems = stems.astype('U1')
+
+  return stems.view(numpy.uint32).reshape(len(stems), -1)
+
+def get_features(codes):
+  return FEATURE_TABLE.take(codes, mode='clip')
+
+def classify(stems):
+  '''
+  ## classify
+  the batch counterpart of `is_front`, `is_rounded`, `get_last_vowel`
+  and `ends_with_consonant`. returns a `Classification` of arrays:
+
+    - `last_vowel`: codepoint of the last vowel, 0 if there is none
+    - `is_front`: the last vowel is a front vowel
+    - `is_rounded`: the last vowel is rounded
+    - `final`: feature bits of the final sound, see `FEATURES`
+    - `missing_vowel`: the stem has no vowel at all, where the
+      scalar functions raise `MissingVowelSound`
+
+  ✎︎ tests
+  ```python
+  >>> result = classify(['kitap', 'üzüm', 'elma', 'x'])
+  >>> [chr(code) for code in result.last_vowel]
+  ['a', 'ü', 'a', '\\x00']
+  >>> result.is_front.tolist()
+  [False, True, False, False]
+  >>> result.is_rounded.tolist()
+  [False, True, False, False]
+  >>> (result.final & CONSONANT).astype(bool).tolist()
+  [True, True, False, False]
+  >>> result.missing_vowel.tolist()
+  [False, False, False, True]
+  >>> classify([]).last_vowel.tolist()
+  []
+
+  ```
+  '''
+  codes = encode(stems)
+  features = get_features(codes)
+  rows = numpy.arange(len(codes))
+
+  vowels = (features & VOWEL).astype(bool)
+  missing_vowel = ~vowels.any(axis=1)
+  position = codes.shape[1] - 1 - vowels[:, ::-1].argmax(axis=1)
+
+  last_vowel = numpy.where(missing_vowel, 0, codes[rows, position])
+  vowel_features = numpy.where(missing_vowel, 0, features[rows, position])
+
+  lengths = (codes != 0).sum(axis=1)
+  final = numpy.where(
+    lengths > 0,
+    features[rows, numpy.maximum(lengths, 1) - 1],
+    0,
+  )
+
+  return Classification(
+    last_vowel,
+    (vowel_features & FRONT).astype(bool),
+    (vowel_features & ROUNDED).astype(bool),
+    final,
+    missing_vowel,
+  )
@@ -1,13 +1,16 @@
+from importlib import import_module
 from inspect import getmembers, isfunction
 
 import kefir
 from kefir import phonology
 from kefir import predication
-from kefir import case
+
+# kefir.subject is shadowed by the subject function on the package
+subject = import_module('kefir.subject')
 
 modules_to_document = [
   kefir,
-  case,
+  subject,
   phonology,
   predication,
 ]
@@ -37,6 +37,9 @@ setup(
     author_email='cediddi@gmail.com',
     license='MIT',
     packages=find_packages(),
+    extras_require={
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python',
@@ -1,19 +1,60 @@
 import unittest
 import doctest
+from importlib import import_module
 
 import kefir
 from kefir import predication
-from kefir import case
 from kefir import phonology
+from kefir import suffix
+from kefir import batch
+from kefir import paradigm
+from kefir import analysis
+from kefir import transducer
+from kefir import lexicon
+from kefir import server
+from kefir import generation
+from kefir import language
+from kefir import pronoun
+from kefir import irregular
+from kefir import normalization
+from kefir import pronunciation
+from kefir import derivation
+from kefir import instrumentation
+
+try:
+  from kefir import vectorized
+except ImportError:
+  vectorized = None
+
+# kefir.subject is shadowed by the subject function on the package
+subject = import_module('kefir.subject')
 
 def run_tests():
   modules_to_test = [
     kefir,
     predication,
-    case,
+    subject,
     phonology,
+    suffix,
+    batch,
+    paradigm,
+    analysis,
+    transducer,
+    lexicon,
+    server,
+    generation,
+    language,
+    pronoun,
+    irregular,
+    normalization,
+    pronunciation,
+    derivation,
+    instrumentation,
   ]
 
+  if vectorized is not None:
+    modules_to_test.append(vectorized)
+
   testSuite = unittest.TestSuite()
 
   for module in modules_to_test: